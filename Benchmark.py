@@ -0,0 +1,229 @@
+"""
+Photo Manager Benchmark
+Times the hot paths of Photo Manager (scan, decode, scale and transfer) against a synthetic image folder.
+Each stage runs in its own process so peak memory is reported per stage.
+
+(c) 2019 Matthew Gallant
+Licensed under the MIT license, check LICENSE.md for more info
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Render Without A Display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+STAGES = ["scan", "captureTime", "decode", "scale", "scaledDecode", "transfer"]
+
+def percentile(values, fraction):
+    if (len(values) == 0):
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def peakMemory():
+    if (resource is None):
+        return None
+
+    # Linux Reports Kilobytes, macOS Reports Bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if (platform.system() != "Darwin"):
+        peak *= 1024
+    return peak
+
+def milliseconds(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+def summarize(latencies, items):
+
+    # Stages With Nothing To Time Report Nulls
+    total = sum(latencies)
+    return {
+        "items": items,
+        "seconds": total,
+        "imagesPerSecond": items / total if total > 0 else None,
+        "p50Ms": milliseconds(percentile(latencies, 0.5)),
+        "p90Ms": milliseconds(percentile(latencies, 0.9)),
+        "p99Ms": milliseconds(percentile(latencies, 0.99)),
+        "maxMs": milliseconds(max(latencies, default=None)),
+        "peakRssBytes": peakMemory(),
+    }
+
+def generateImages(folder, count, width, height, pngRatio, seed):
+    from PyQt5.QtGui import QGuiApplication, QImage, QColor, QPainter
+
+    app = QGuiApplication(sys.argv[:1])
+    os.makedirs(folder, exist_ok=True)
+    generator = random.Random(seed)
+
+    # Shapes & Lines Give The Encoders Realistic Work
+    for index in range(count):
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(generator.randint(0, 255), generator.randint(0, 255), generator.randint(0, 255)))
+        painter = QPainter(image)
+        for shape in range(40):
+            painter.fillRect(generator.randint(0, width), generator.randint(0, height), generator.randint(1, width // 4), generator.randint(1, height // 4), QColor(generator.randint(0, 255), generator.randint(0, 255), generator.randint(0, 255)))
+        painter.setPen(QColor(0, 0, 0))
+        for line in range(200):
+            painter.drawLine(generator.randint(0, width), generator.randint(0, height), generator.randint(0, width), generator.randint(0, height))
+        painter.end()
+
+        if (generator.random() < pngRatio):
+            image.save(os.path.join(folder, "image%05d.png" % index), "PNG")
+        else:
+            image.save(os.path.join(folder, "image%05d.jpg" % index), "JPG", 90)
+
+def runStage(stage, folder, options):
+    from PyQt5.QtGui import QImageReader
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+    import PhotoManager
+
+    app = QApplication(sys.argv[:1])
+    images = sorted(PhotoManager.scanImages(folder))
+    latencies = []
+
+    if (stage == "scan"):
+        for repeat in range(options.repeat):
+            startTime = time.perf_counter()
+            found = sum(1 for image in PhotoManager.scanImages(folder))
+            latencies.append(time.perf_counter() - startTime)
+        return summarize(latencies, found * options.repeat)
+
+    if (stage == "captureTime"):
+        for image in images:
+            startTime = time.perf_counter()
+            PhotoManager.readCaptureTime(image)
+            latencies.append(time.perf_counter() - startTime)
+
+    elif (stage == "decode"):
+        for image in images:
+            startTime = time.perf_counter()
+            QImageReader(image).read()
+            latencies.append(time.perf_counter() - startTime)
+
+    elif (stage == "scale"):
+        for image in images:
+            decoded = QImageReader(image).read()
+            startTime = time.perf_counter()
+            decoded.scaledToWidth(options.display_width, mode=Qt.SmoothTransformation)
+            latencies.append(time.perf_counter() - startTime)
+
+    elif (stage == "scaledDecode"):
+        for image in images:
+            startTime = time.perf_counter()
+            PhotoManager.readScaledImage(image, options.display_width)
+            latencies.append(time.perf_counter() - startTime)
+
+    elif (stage == "transfer"):
+        destination = tempfile.mkdtemp(prefix="photomanager-transfer-", dir=options.transfer_folder)
+        try:
+            for image in images:
+                startTime = time.perf_counter()
+                PhotoManager.transferFile(image, os.path.join(destination, os.path.basename(image)), options.mode)
+                latencies.append(time.perf_counter() - startTime)
+        finally:
+            shutil.rmtree(destination, ignore_errors=True)
+
+    return summarize(latencies, len(images))
+
+def compareBaseline(results, baselineLocation):
+    with open(baselineLocation, "r", encoding="utf-8") as baselineFile:
+        baseline = json.load(baselineFile)
+
+    print("%-14s %14s %14s %9s" % ("stage", "baseline/s", "current/s", "change"))
+    for stage, result in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if (previous is None or not previous.get("imagesPerSecond") or not result.get("imagesPerSecond")):
+            continue
+        change = result["imagesPerSecond"] / previous["imagesPerSecond"] - 1
+        print("%-14s %14.1f %14.1f %+8.1f%%" % (stage, previous["imagesPerSecond"], result["imagesPerSecond"], change * 100))
+
+def main(arguments):
+    parser = argparse.ArgumentParser(description="Benchmark Photo Manager's scan, decode, scale and transfer paths.")
+    parser.add_argument("--count", type=int, default=50, help="number of synthetic images (default: 50)")
+    parser.add_argument("--width", type=int, default=4000, help="synthetic image width (default: 4000)")
+    parser.add_argument("--height", type=int, default=3000, help="synthetic image height (default: 3000)")
+    parser.add_argument("--png-ratio", type=float, default=0.2, help="fraction of images saved as PNG (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the synthetic images (default: 1)")
+    parser.add_argument("--folder", help="benchmark an existing folder instead of generating one")
+    parser.add_argument("--display-width", type=int, default=800, help="width images are scaled to (default: 800)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of folder scans to time (default: 5)")
+    parser.add_argument("--mode", choices=["Copy", "Verified Copy", "Hardlink", "Reflink"], default="Copy", help="transfer mode to time, Move is left out so sources survive (default: Copy)")
+    parser.add_argument("--transfer-folder", help="where transfers are written (default: system temp folder)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma separated stages to run (default: all)")
+    parser.add_argument("--output", default="benchmark.json", help="JSON results file (default: benchmark.json)")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--stage", help=argparse.SUPPRESS)
+    options = parser.parse_args(arguments)
+
+    # Child Process For A Single Stage
+    if (options.stage is not None):
+        print(json.dumps(runStage(options.stage, options.folder, options)))
+        return 0
+
+    folder = options.folder
+    generatedFolder = None
+    if (folder is None):
+        generatedFolder = tempfile.mkdtemp(prefix="photomanager-benchmark-")
+        folder = generatedFolder
+        print("Generating %d images of %dx%d..." % (options.count, options.width, options.height))
+        generateImages(folder, options.count, options.width, options.height, options.png_ratio, options.seed)
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processors": os.cpu_count(),
+            "count": options.count if generatedFolder is not None else None,
+            "size": [options.width, options.height] if generatedFolder is not None else None,
+            "folder": options.folder,
+            "displayWidth": options.display_width,
+            "mode": options.mode,
+        },
+        "stages": {},
+    }
+
+    # Options Each Stage Process Needs
+    stageArguments = ["--folder", folder, "--display-width", str(options.display_width), "--repeat", str(options.repeat), "--mode", options.mode]
+    if (options.transfer_folder is not None):
+        stageArguments += ["--transfer-folder", options.transfer_folder]
+
+    try:
+        for stage in options.stages.split(","):
+            print("Running %s..." % stage)
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--stage", stage] + stageArguments, check=True, stdout=subprocess.PIPE).stdout
+            results["stages"][stage] = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+            stageResult = results["stages"][stage]
+            if (stageResult["p50Ms"] is None):
+                print("  No images to time")
+            else:
+                print("  %.1f images/s, p50 %.2f ms, p99 %.2f ms" % (stageResult["imagesPerSecond"] or 0, stageResult["p50Ms"], stageResult["p99Ms"]))
+    finally:
+        if (generatedFolder is not None):
+            shutil.rmtree(generatedFolder, ignore_errors=True)
+
+    with open(options.output, "w", encoding="utf-8") as outputFile:
+        json.dump(results, outputFile, indent=2)
+    print("Results written to " + options.output)
+
+    if (options.baseline is not None):
+        compareBaseline(results, options.baseline)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
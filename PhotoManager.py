@@ -10,18 +10,1551 @@ Licensed under the MIT license, check LICENSE.md for more info
 
 import sys
 import os
-import glob
+import argparse
 import base64
+import csv
+import errno
+import hashlib
 import io
 import platform
 import ctypes
+import json
+import mmap
+import queue
+import multiprocessing
+import sqlite3
+import struct
+import threading
+import time
+
+from shutil import copyfile, move
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux ioctl Request For Copy-On-Write File Clones
+FICLONE = 0x40049409
+
+TRANSFER_MODES = ["Copy", "Verified Copy", "Hardlink", "Reflink", "Move"]
+
+class PerformanceMonitor():
+
+    def __init__(self, windowSize=500):
+        self.windowSize = windowSize
+        self.samples = {}
+        self.lock = threading.Lock()
+        self.logFile = None
+
+    @contextmanager
+    def span(self, name, **details):
+        startTime = time.perf_counter()
+        try:
+            yield details
+        finally:
+            self.record(name, time.perf_counter() - startTime, details)
+
+    def record(self, name, seconds, details=None):
+        with self.lock:
+
+            # Keep A Rolling Window Of Recent Durations Per Span
+            if (name not in self.samples):
+                self.samples[name] = deque(maxlen=self.windowSize)
+            self.samples[name].append(seconds)
+
+            # One JSON Event Per Operation
+            if (self.logFile is not None):
+                event = {"time": time.time(), "span": name, "ms": round(seconds * 1000, 3), "thread": threading.current_thread().name}
+                event.update(details or {})
+                self.logFile.write(json.dumps(event) + "\n")
+
+    def summary(self):
+        with self.lock:
+            samples = {name: sorted(durations) for name, durations in self.samples.items()}
+
+        rows = []
+        for name, durations in sorted(samples.items()):
+            rows.append((name, len(durations), durations[len(durations) // 2] * 1000, durations[int(len(durations) * 0.9)] * 1000, durations[-1] * 1000))
+        return rows
+
+    def startLog(self, logLocation):
+        self.stopLog()
+        with self.lock:
+            self.logFile = open(logLocation, "a", encoding="utf-8", buffering=1)
+
+    def stopLog(self):
+        with self.lock:
+            if (self.logFile is not None):
+                self.logFile.close()
+                self.logFile = None
+
+# Shared By The GUI, Its Worker Threads & The Batch Mode
+monitor = PerformanceMonitor()
+
+RAW_EXTENSIONS = {".cr2", ".nef", ".arw", ".dng"}
+
+IMAGE_EXTENSIONS = {".jpeg", ".jpg", ".png"} | RAW_EXTENSIONS
+
+# Files Sharing A RAW File's Name That Travel With It
+SIDECAR_EXTENSIONS = [".jpg", ".jpeg", ".xmp"]
+
+# Folders Created By Photo Manager Itself
+SKIPPED_FOLDERS = {"Keep", "Discard", "Export"}
+
+# Resized Copies Of Kept Images Go In A Folder Per Size
+EXPORT_FOLDER = "Export"
+
+def iterFolder(folderName, recursive=False, subfolders=None):
+    try:
+        entries = os.scandir(folderName)
+    except OSError:
+        return
+
+    jpegs = []
+    rawStems = set()
+    with entries:
+        for entry in entries:
+            try:
+                if (entry.is_file()):
+                    stem, extension = os.path.splitext(entry.name)
+                    stem, extension = stem.lower(), extension.lower()
+                    if (extension in RAW_EXTENSIONS):
+                        rawStems.add(stem)
+                        yield entry.path
+
+                    # JPEGs Wait For The Whole Listing In Case Their RAW File Comes Later
+                    elif (extension in (".jpg", ".jpeg")):
+                        if (stem not in rawStems):
+                            jpegs.append((stem, entry.path))
+                    elif (extension in IMAGE_EXTENSIONS):
+                        yield entry.path
+                elif (recursive and subfolders is not None and entry.is_dir(follow_symlinks=False) and entry.name not in SKIPPED_FOLDERS and not entry.name.startswith(".")):
+                    subfolders.append(entry.path)
+            except OSError:
+                pass
+
+    # JPEGs Shot Alongside A RAW File Are Sidecars, Not Separate Images
+    for stem, path in jpegs:
+        if (stem not in rawStems):
+            yield path
+
+def listFolder(folderName, recursive=False):
+    subfolders = []
+    images = list(iterFolder(folderName, recursive, subfolders))
+    return images, subfolders
+
+def scanImages(folderName, recursive=False):
+    folders = [folderName]
+    while (len(folders) > 0):
+        subfolders = []
+        for image in iterFolder(folders.pop(), recursive, subfolders):
+            yield image
+
+        # Visit Subfolders In Name Order
+        folders.extend(sorted(subfolders, reverse=True))
+
+def findSidecars(imageLocation):
+    stem = os.path.splitext(imageLocation)[0]
+    candidates = [imageLocation + ".xmp", imageLocation + ".XMP"]
+    for extension in SIDECAR_EXTENSIONS:
+        candidates += [stem + extension, stem + extension.upper()]
+
+    # Case-Insensitive Filesystems Match Several Spellings Of One File
+    sidecars = []
+    seen = set()
+    for candidate in candidates:
+        try:
+            stat = os.stat(candidate)
+        except OSError:
+            continue
+        if ((stat.st_dev, stat.st_ino) not in seen):
+            seen.add((stat.st_dev, stat.st_ino))
+            sidecars.append(candidate)
+
+    return sidecars
+
+def isDisplayableJpeg(data, start, length):
+    end = start + length
+    if (data[start:start + 2] != b"\xff\xd8"):
+        return False
+
+    # Walk The Markers Up To The Frame Header, Rejecting Lossless RAW Data
+    position = start + 2
+    while (position + 4 <= end):
+        if (data[position] != 0xFF):
+            return False
+        marker = data[position + 1]
+        if (marker == 0xFF):
+            position += 1
+        elif (marker in (0xC0, 0xC1, 0xC2)):
+            return True
+        elif (marker == 0xDA or marker in (0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF)):
+            return False
+        else:
+            position += 2 + struct.unpack_from(">H", data, position + 2)[0]
+
+    return False
+
+def findRawPreview(data):
+    if (data[:4] == b"II*\x00"):
+        order = "<"
+    elif (data[:4] == b"MM\x00*"):
+        order = ">"
+    else:
+        return None
+
+    firstIfd = struct.unpack_from(order + "I", data, 4)[0]
+    ifds = [firstIfd]
+    visited = set()
+    candidates = []
+    orientation = 1
+
+    # Walk Every IFD & Sub-IFD Reading Only The Tags That Locate JPEG Data
+    while (len(ifds) > 0):
+        offset = ifds.pop()
+        if (offset == 0 or offset in visited or offset + 2 > len(data)):
+            continue
+        visited.add(offset)
+
+        count = struct.unpack_from(order + "H", data, offset)[0]
+        if (offset + 2 + count * 12 + 4 > len(data)):
+            continue
+
+        tags = {}
+        for index in range(count):
+            entry = offset + 2 + index * 12
+            tag, fieldType, valueCount = struct.unpack_from(order + "HHI", data, entry)
+            if (tag not in (0x0103, 0x0111, 0x0112, 0x0117, 0x014A, 0x0201, 0x0202) or valueCount > 64):
+                continue
+
+            # SHORT Values Are 2 Bytes, LONG & IFD Values Are 4
+            size = {3: 2, 4: 4, 13: 4}.get(fieldType)
+            if (size is None):
+                continue
+            valueOffset = entry + 8 if size * valueCount <= 4 else struct.unpack_from(order + "I", data, entry + 8)[0]
+            if (valueOffset + size * valueCount > len(data)):
+                continue
+            tags[tag] = struct.unpack_from(order + ("H" if size == 2 else "I") * valueCount, data, valueOffset)
+
+        if (0x0201 in tags and 0x0202 in tags):
+            candidates.append((tags[0x0201][0], tags[0x0202][0]))
+        if (0x0111 in tags and 0x0117 in tags and len(tags[0x0111]) == 1 and tags.get(0x0103, (0,))[0] in (6, 7)):
+            candidates.append((tags[0x0111][0], tags[0x0117][0]))
+        if (0x0112 in tags and offset == firstIfd):
+            orientation = tags[0x0112][0]
+
+        ifds.extend(tags.get(0x014A, ()))
+        ifds.append(struct.unpack_from(order + "I", data, offset + 2 + count * 12)[0])
+
+    # Use The Largest Preview A JPEG Decoder Can Handle
+    best = None
+    for start, length in candidates:
+        if (length > 0 and start + length <= len(data) and (best is None or length > best[1]) and isDisplayableJpeg(data, start, length)):
+            best = (start, length)
+
+    if (best is None):
+        return None
+    return best[0], best[1], orientation
+
+def readRawPreview(imageLocation):
+    with open(imageLocation, "rb") as rawFile:
+
+        # Map The File So Only The Headers & The Preview Are Read From Disk
+        try:
+            data = mmap.mmap(rawFile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None, 1
+
+        with data:
+            try:
+                preview = findRawPreview(data)
+            except struct.error:
+                preview = None
+            if (preview is None):
+                return None, 1
+            return data[preview[0]:preview[0] + preview[1]], preview[2]
+
+# Capture Times Sit In The First Few KB Of JPEG & RAW Files
+CAPTURE_READ_SIZE = 64 * 1024
+
+def findExifData(data):
+    if (data[:4] in (b"II*\x00", b"MM\x00*")):
+        return data
+
+    # Walk JPEG Markers Up To The Exif APP1 Segment
+    if (data[:2] != b"\xff\xd8"):
+        return None
+    position = 2
+    while (position + 4 <= len(data) and data[position] == 0xFF):
+        marker = data[position + 1]
+        length = struct.unpack_from(">H", data, position + 2)[0]
+        if (marker == 0xE1 and data[position + 4:position + 10] == b"Exif\x00\x00"):
+            return data[position + 10:position + 2 + length]
+        if (marker in (0xD9, 0xDA)):
+            return None
+        position += 2 + length
+    return None
+
+def findCaptureTime(data):
+    data = findExifData(data)
+    if (data is None or len(data) < 8):
+        return None
+    order = "<" if data[:2] == b"II" else ">"
+
+    # Read The ASCII Date Tags From IFD0 & The Exif Sub-IFD
+    tags = {}
+    ifds = [struct.unpack_from(order + "I", data, 4)[0]]
+    visited = set()
+    while (len(ifds) > 0):
+        offset = ifds.pop()
+        if (offset == 0 or offset in visited or offset + 2 > len(data)):
+            continue
+        visited.add(offset)
+        count = struct.unpack_from(order + "H", data, offset)[0]
+        for index in range(count):
+            entry = offset + 2 + index * 12
+            if (entry + 12 > len(data)):
+                break
+            tag, fieldType, valueCount = struct.unpack_from(order + "HHI", data, entry)
+            if (tag == 0x8769 and fieldType in (4, 13)):
+                ifds.append(struct.unpack_from(order + "I", data, entry + 8)[0])
+            elif (tag in (0x0132, 0x9003, 0x9291) and fieldType == 2):
+                valueOffset = entry + 8 if valueCount <= 4 else struct.unpack_from(order + "I", data, entry + 8)[0]
+                tags[tag] = bytes(data[valueOffset:valueOffset + valueCount]).split(b"\x00")[0].decode("ascii", "replace").strip()
+
+    captureTime = tags.get(0x9003) or tags.get(0x0132)
+    if (not captureTime or len(captureTime) < 19 or captureTime.startswith("0000")):
+        return None
+
+    # Sub-Second Digits Separate Burst Frames Shot In The Same Second
+    subSeconds = tags.get(0x9291, "")
+    if (subSeconds.isdigit()):
+        captureTime = captureTime[:19] + "." + subSeconds
+    return captureTime[:19].replace("-", ":") + captureTime[19:]
+
+def readCaptureTime(imageLocation):
+    try:
+        with open(imageLocation, "rb") as imageFile:
+            return findCaptureTime(imageFile.read(CAPTURE_READ_SIZE))
+    except (OSError, struct.error):
+        return None
+
+class CaptureTimeIndex():
+
+    def __init__(self, databaseLocation):
+        self.databaseLocation = databaseLocation
+        self.connections = threading.local()
+
+        try:
+            os.makedirs(os.path.dirname(databaseLocation), exist_ok=True)
+            connection = self.connection()
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS captureTimes (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, time TEXT)")
+            connection.commit()
+            self.enabled = True
+        except (OSError, sqlite3.Error):
+            self.enabled = False
+
+    def connection(self):
+
+        # SQLite Connections Cannot Be Shared Between Threads
+        if (not hasattr(self.connections, "connection")):
+            self.connections.connection = sqlite3.connect(self.databaseLocation, timeout=5)
+        return self.connections.connection
+
+    def get(self, images):
+        if (not self.enabled):
+            return {}
+
+        # Look Paths Up In Chunks To Stay Under SQLite's Variable Limit
+        rows = {}
+        try:
+            connection = self.connection()
+            for start in range(0, len(images), 500):
+                chunk = images[start:start + 500]
+                query = "SELECT path, mtime, size, time FROM captureTimes WHERE path IN (%s)" % ",".join("?" * len(chunk))
+                for path, mtime, size, captureTime in connection.execute(query, chunk):
+                    rows[path] = (mtime, size, captureTime)
+        except sqlite3.Error:
+            return {}
+        return rows
+
+    def put(self, rows):
+        if (not self.enabled or len(rows) == 0):
+            return
+
+        try:
+            connection = self.connection()
+            connection.executemany("INSERT OR REPLACE INTO captureTimes VALUES (?, ?, ?, ?)", rows)
+            connection.commit()
+        except sqlite3.Error:
+            pass
+
+def statImage(imageLocation):
+    try:
+        stat = os.stat(imageLocation)
+        return imageLocation, stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return imageLocation, 0, 0
+
+def sortByCaptureTime(images, index=None, jobs=8):
+    with monitor.span("captureSort", images=len(images)) as details:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            stats = list(executor.map(statImage, images, chunksize=64))
+
+            # Only Read Files That Are New Or Changed Since They Were Indexed
+            indexed = index.get(images) if index is not None else {}
+            missing = [stat for stat in stats if indexed.get(stat[0], (None, None))[:2] != stat[1:]]
+            captureTimes = dict(zip((stat[0] for stat in missing), executor.map(readCaptureTime, (stat[0] for stat in missing), chunksize=16)))
+        details["read"] = len(missing)
+
+        if (index is not None):
+            index.put([(path, mtime, size, captureTimes[path]) for path, mtime, size in missing])
+
+        # Files Without Exif Fall Back To Their Modified Time
+        keys = {}
+        for path, mtime, size in stats:
+            captureTime = captureTimes[path] if path in captureTimes else indexed[path][2]
+            if (captureTime is None):
+                captureTime = time.strftime("%Y:%m:%d %H:%M:%S", time.localtime(mtime / 1e9))
+            keys[path] = (captureTime, path)
+
+        return sorted(images, key=keys.get)
+
+def reflinkFile(source, destination):
+    with open(source, "rb") as sourceFile, open(destination, "wb") as destinationFile:
+
+        # Try A Copy-On-Write Clone (Btrfs, XFS)
+        if (fcntl is not None):
+            try:
+                fcntl.ioctl(destinationFile.fileno(), FICLONE, sourceFile.fileno())
+                return
+            except OSError:
+                pass
+
+        # Try An In-Kernel Copy On The Same Filesystem
+        if (hasattr(os, "copy_file_range")):
+            remaining = os.fstat(sourceFile.fileno()).st_size
+            try:
+                while (remaining > 0):
+                    copied = os.copy_file_range(sourceFile.fileno(), destinationFile.fileno(), remaining)
+                    if (copied == 0):
+                        break
+                    remaining -= copied
+                if (remaining == 0):
+                    return
+            except OSError:
+                pass
+
+    copyfile(source, destination)
+
+# b2sum Compatible List Of Verified Copies Kept Beside Them
+HASH_MANIFEST_NAME = "BLAKE2SUMS"
+
+# Parallel Transfers Share Each Folder's Manifest
+manifestLock = threading.Lock()
+
+def verifiedCopyFile(source, destination):
+    digest = hashlib.blake2b()
+
+    # Hash The Data On Its Way Through So It Is Only Read Once
+    with open(source, "rb") as sourceFile, open(destination, "wb") as destinationFile:
+        while True:
+            chunk = sourceFile.read(1024 * 1024)
+            if (len(chunk) == 0):
+                break
+            digest.update(chunk)
+            destinationFile.write(chunk)
+        destinationFile.flush()
+        os.fsync(destinationFile.fileno())
+
+    hexDigest = digest.hexdigest()
+    with manifestLock:
+        with open(os.path.join(os.path.dirname(destination), HASH_MANIFEST_NAME), "a", encoding="utf-8") as manifestFile:
+            manifestFile.write(hexDigest + "  " + os.path.basename(destination) + "\n")
+            manifestFile.flush()
+            os.fsync(manifestFile.fileno())
+    return hexDigest
+
+# Append-Only Record Of Decisions Kept In The Destination Folder
+JOURNAL_NAME = ".photomanager-journal"
+
+class DecisionJournal():
+
+    def __init__(self, journalLocation):
+        self.folder = os.path.dirname(journalLocation)
+        self.journalFile = open(journalLocation, "ab+")
+
+        # Terminate A Record Torn By A Crash Before Appending
+        self.journalFile.seek(0, os.SEEK_END)
+        if (self.journalFile.tell() > 0):
+            self.journalFile.seek(-1, os.SEEK_END)
+            if (self.journalFile.read(1) != b"\n"):
+                self.journalFile.write(b"\n")
+
+    def write(self, record):
+        self.journalFile.write((json.dumps(record) + "\n").encode("utf-8"))
+        self.journalFile.flush()
+
+    def close(self):
+        os.fsync(self.journalFile.fileno())
+        self.journalFile.close()
+
+def readJournal(journalLocation):
+    session = {"source": "", "images": [], "scanned": False, "decisions": {}, "transferred": set()}
+
+    with open(journalLocation, "rb") as journalFile:
+        for line in journalFile:
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except ValueError:
+                continue
+
+            event = record.get("event")
+            if (event == "session"):
+                session["source"] = record["source"]
+            elif (event == "found"):
+                session["images"].extend(record["images"])
+            elif (event == "ordered"):
+                rank = {image: position for position, image in enumerate(record["images"])}
+                session["images"].sort(key=lambda image: rank.get(image, len(rank)))
+            elif (event == "scanned"):
+                session["scanned"] = True
+            elif (event == "decision"):
+                session["decisions"][record["image"]] = (record["destination"], record["mode"])
+            elif (event == "transferred"):
+                session["transferred"].add(record["image"])
+
+    return session
+
+class BKTree():
 
-from shutil import copyfile
+    def __init__(self):
+        self.root = None
+
+    def add(self, value):
+        if (self.root is None):
+            self.root = (value, {})
+            return
+
+        node = self.root
+        while (True):
+            distance = hammingDistance(value, node[0])
+            if (distance == 0):
+                return
+            if (distance not in node[1]):
+                node[1][distance] = (value, {})
+                return
+            node = node[1][distance]
+
+    def search(self, value, threshold):
+        matches = []
+        nodes = [self.root] if self.root is not None else []
+
+        # Only Follow Children That Can Be Within The Threshold
+        while (len(nodes) > 0):
+            node = nodes.pop()
+            distance = hammingDistance(value, node[0])
+            if (distance <= threshold):
+                matches.append(node[0])
+            for childDistance, child in node[1].items():
+                if (distance - threshold <= childDistance <= distance + threshold):
+                    nodes.append(child)
+
+        return matches
+
+def hammingDistance(first, second):
+    return bin(first ^ second).count("1")
+
+def groupSimilarImages(images, hashes, threshold=10):
+
+    # Images With Identical Hashes Share One Tree Entry
+    imagesByHash = {}
+    for image in images:
+        if (hashes.get(image) is not None):
+            imagesByHash.setdefault(hashes[image], []).append(image)
+
+    tree = BKTree()
+    for value in imagesByHash:
+        tree.add(value)
+
+    # Union Every Hash With Its Near Neighbours
+    parents = {value: value for value in imagesByHash}
+    def findRoot(value):
+        while (parents[value] != value):
+            parents[value] = parents[parents[value]]
+            value = parents[value]
+        return value
+
+    for value in imagesByHash:
+        for match in tree.search(value, threshold):
+            parents[findRoot(match)] = findRoot(value)
+
+    # Collect Groups In The Original Image Order
+    groups = {}
+    for image in images:
+        if (hashes.get(image) is not None):
+            groups.setdefault(findRoot(hashes[image]), []).append(image)
+
+    return [group for group in groups.values() if len(group) > 1]
+
+def sidecarDestinations(source, destination):
+
+    # Sidecars Take The Image's Destination Name In Place Of Its Own Stem
+    if (os.path.splitext(source)[1].lower() not in RAW_EXTENSIONS):
+        return []
+    sourceStem = os.path.splitext(source)[0]
+    destinationStem = os.path.splitext(destination)[0]
+    return [(sidecar, destinationStem + sidecar[len(sourceStem):]) for sidecar in findSidecars(source)]
+
+def uniqueDestination(folderName, imageLocation, taken):
+
+    # Images From Different Subfolders Can Share A Name, Number The Later Ones
+    stem, extension = os.path.splitext(os.path.basename(imageLocation))
+    destination = os.path.join(folderName, stem + extension)
+    number = 2
+    while True:
+
+        # The Image & Its Sidecars Need A Name That Is Free For All Of Them
+        paths = [destination] + [sidecarDestination for sidecar, sidecarDestination in sidecarDestinations(imageLocation, destination)]
+        if (not any(path in taken or os.path.lexists(path) for path in paths)):
+            break
+        destination = os.path.join(folderName, "%s (%d)%s" % (stem, number, extension))
+        number += 1
+
+    taken.update(paths)
+    return destination
+
+def transferFile(source, destination, mode, overwrite=False):
+    with monitor.span("transfer", path=source, mode=mode) as details:
+        details["bytes"] = os.path.getsize(source)
+
+        # Never Replace A File That Is Already There, Checking Sidecars Before Anything Moves
+        sidecars = sidecarDestinations(source, destination)
+        for path in [destination] + [sidecarDestination for sidecar, sidecarDestination in sidecars]:
+            if (os.path.lexists(path) and not overwrite):
+                raise FileExistsError(errno.EEXIST, "Destination already exists", path)
+        if (os.path.lexists(destination)):
+            os.remove(destination)
+
+        if (mode == "Hardlink"):
+            try:
+                os.link(source, destination)
+            except OSError:
+                copyfile(source, destination)
+        elif (mode == "Reflink"):
+            reflinkFile(source, destination)
+        elif (mode == "Verified Copy"):
+            details["hash"] = verifiedCopyFile(source, destination)
+        elif (mode == "Move"):
+            move(source, destination)
+        else:
+            copyfile(source, destination)
+
+        # Carry Sidecar JPEG & XMP Files Along With RAW Files
+        details["sidecars"] = len(sidecars)
+        for sidecar, sidecarDestination in sidecars:
+            transferFile(sidecar, sidecarDestination, mode, overwrite)
+
+def readManifest(manifestLocation):
+    manifestFolder = os.path.dirname(os.path.abspath(manifestLocation))
+    decisions = []
+
+    # Decisions Journaled By A GUI Session
+    if (os.path.basename(manifestLocation) == JOURNAL_NAME):
+        for image, (destination, mode) in readJournal(manifestLocation)["decisions"].items():
+            decisions.append((image, os.path.basename(os.path.dirname(destination))))
+
+    # JSON Object Of Path To Decision, Or A List Of {"path", "decision"} Objects
+    elif (manifestLocation.lower().endswith(".json")):
+        with open(manifestLocation, "r", encoding="utf-8") as manifestFile:
+            manifest = json.load(manifestFile)
+        if (isinstance(manifest, dict)):
+            decisions = list(manifest.items())
+        else:
+            decisions = [(entry["path"], entry["decision"]) for entry in manifest]
+
+    # CSV Rows Of Path, Decision With An Optional Header
+    else:
+        with open(manifestLocation, "r", encoding="utf-8", newline="") as manifestFile:
+            reader = csv.reader(manifestFile)
+            for row in reader:
+                if (len(row) == 0):
+                    continue
+                elif (len(row) < 2):
+                    raise ValueError("Missing decision on line " + str(reader.line_num))
+
+                # Only A First Line Naming The Decision Column Is A Header, So Typos Still Fail Below
+                elif (reader.line_num == 1 and row[1].strip().lower() == "decision"):
+                    continue
+                decisions.append((row[0], row[1]))
+
+    resolved = []
+    for image, decision in decisions:
+        decision = decision.strip().lower()
+        if (decision not in ("keep", "discard")):
+            raise ValueError("Unknown decision '" + decision + "' for " + image)
+        resolved.append((os.path.join(manifestFolder, image), decision.capitalize()))
+
+    return resolved
+
+def runBatch(arguments):
+    parser = argparse.ArgumentParser(prog="PhotoManager", description="Apply a keep/discard manifest without starting the GUI.")
+    parser.add_argument("--apply", required=True, metavar="MANIFEST", help="CSV or JSON of path to keep/discard, or a " + JOURNAL_NAME + " file")
+    parser.add_argument("--destination", required=True, help="folder to create Keep and Discard in")
+    parser.add_argument("--mode", choices=TRANSFER_MODES, default="Copy", help="how files are transferred (default: Copy)")
+    parser.add_argument("--jobs", type=int, default=4, help="number of parallel transfers (default: 4)")
+    parser.add_argument("--log", help="write a JSON-lines event for every transfer to this file")
+    options = parser.parse_args(arguments)
+
+    if (options.log is not None):
+        monitor.startLog(options.log)
+
+    try:
+        decisions = readManifest(options.apply)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print("Could not read manifest: " + str(e), file=sys.stderr)
+        return 2
+
+    os.makedirs(os.path.join(options.destination, "Keep"), exist_ok=True)
+    os.makedirs(os.path.join(options.destination, "Discard"), exist_ok=True)
+
+    def transferDecision(image, destination):
+        size = os.path.getsize(image)
+        transferFile(image, destination, options.mode)
+        return size
+
+    # Pick Every Destination Up Front So Parallel Transfers Never Share One
+    taken = set()
+    decisions = [(image, uniqueDestination(os.path.join(options.destination, folder), image, taken)) for image, folder in decisions]
+
+    # Carry Out Transfers In Parallel
+    startTime = time.perf_counter()
+    transferred = 0
+    transferredBytes = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, options.jobs)) as executor:
+        futures = {executor.submit(transferDecision, image, destination): image for image, destination in decisions}
+        for future in as_completed(futures):
+            try:
+                transferredBytes += future.result()
+                transferred += 1
+            except OSError as e:
+                failed += 1
+                print("Could not transfer " + futures[future] + ": " + str(e), file=sys.stderr)
+    elapsed = max(time.perf_counter() - startTime, 1e-9)
+
+    print("Transferred %d files (%.1f MB) in %.2f s: %.1f files/s, %.1f MB/s, %d failed" % (transferred, transferredBytes / 1e6, elapsed, transferred / elapsed, transferredBytes / 1e6 / elapsed, failed))
+    monitor.stopLog()
+    return 1 if failed > 0 else 0
+
+# Apply A Manifest Headlessly Before Any Qt Module Is Imported
+if (__name__ == '__main__' and any(argument == "--apply" or argument.startswith("--apply=") for argument in sys.argv[1:])):
+    sys.exit(runBatch(sys.argv[1:]))
 
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 
+# Rotation Needed For Each TIFF Orientation Value
+RAW_ROTATIONS = {3: 180, 6: 90, 8: 270}
+
+# Size Of The Square Tiles Used By The Actual Size Viewer
+TILE_SIZE = 512
+
+def openImageReader(imageLocation):
+    orientation = 1
+    buffer = None
+
+    # Show RAW Files Using Their Embedded JPEG Preview
+    if (os.path.splitext(imageLocation)[1].lower() in RAW_EXTENSIONS):
+        with monitor.span("rawPreview", path=imageLocation):
+            preview, orientation = readRawPreview(imageLocation)
+        buffer = QBuffer()
+        buffer.setData(preview or b"")
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+    else:
+        reader = QImageReader(imageLocation)
+
+    # The Buffer Must Outlive The Reader
+    return reader, buffer, orientation
+
+def readScaledImage(imageLocation, imageWidth):
+    reader, buffer, orientation = openImageReader(imageLocation)
+    size = reader.size()
+    sideways = orientation in (6, 8)
+    shownWidth = size.height() if sideways else size.width()
+
+    # Let libjpeg Skip Detail That Will Not Be Shown By Decoding At 1/2, 1/4 Or 1/8 Size
+    if (reader.format() in (b"jpeg", b"jpg") and size.isValid()):
+        scale = 1
+        while (scale < 8 and shownWidth // (scale * 2) >= imageWidth):
+            scale *= 2
+        if (scale > 1):
+            reader.setScaledSize(QSize((size.width() + scale - 1) // scale, (size.height() + scale - 1) // scale))
+
+    with monitor.span("decode", path=imageLocation, width=size.width(), height=size.height()):
+        image = reader.read()
+    if (image.isNull()):
+        return image
+
+    with monitor.span("scale", path=imageLocation):
+        if (sideways):
+            image = image.scaledToHeight(imageWidth, mode=Qt.SmoothTransformation)
+        else:
+            image = image.scaledToWidth(imageWidth, mode=Qt.SmoothTransformation)
+
+    # Turn RAW Previews Upright Using The Camera's Orientation Tag
+    if (orientation in RAW_ROTATIONS):
+        image = image.transformed(QTransform().rotate(RAW_ROTATIONS[orientation]))
+
+    return image
+
+def imageDisplaySize(imageLocation):
+    reader, buffer, orientation = openImageReader(imageLocation)
+    size = reader.size()
+    if (orientation in (6, 8)):
+        return QSize(size.height(), size.width())
+    return size
+
+def sourceRect(rect, size, orientation):
+
+    # Map A Rectangle Of The Upright Image Back Onto The Stored Pixels
+    if (orientation == 3):
+        return QRect(size.width() - rect.x() - rect.width(), size.height() - rect.y() - rect.height(), rect.width(), rect.height())
+    elif (orientation == 6):
+        return QRect(rect.y(), size.height() - rect.x() - rect.width(), rect.height(), rect.width())
+    elif (orientation == 8):
+        return QRect(size.width() - rect.y() - rect.height(), rect.x(), rect.height(), rect.width())
+    return QRect(rect)
+
+def readImageBands(imageLocation, bandRects):
+    reader, buffer, orientation = openImageReader(imageLocation)
+    size = reader.size()
+    bands = []
+
+    # Decode Only The Requested Rows Where The Format Allows It
+    if (reader.supportsOption(QImageIOHandler.ClipRect)):
+        for rect in bandRects:
+            reader, buffer, orientation = openImageReader(imageLocation)
+            reader.setClipRect(sourceRect(rect, size, orientation))
+            with monitor.span("decodeRegion", path=imageLocation, y=rect.y(), height=rect.height()):
+                band = reader.read()
+            if (orientation in RAW_ROTATIONS and not band.isNull()):
+                band = band.transformed(QTransform().rotate(RAW_ROTATIONS[orientation]))
+            bands.append(band)
+
+    # Otherwise Decode Once Into An Uncompressed Pixel File & Read Rows Back From It
+    else:
+        pixelsLocation = decodePixels(imageLocation, reader)
+        with open(pixelsLocation, "rb") as pixelsFile:
+            pixelFormat = struct.unpack("<I", pixelsFile.read(4))[0]
+            for rect in bandRects:
+                with monitor.span("readPixels", path=imageLocation, y=rect.y(), height=rect.height()):
+                    pixelsFile.seek(4 + rect.y() * size.width() * 4)
+                    data = pixelsFile.read(rect.height() * size.width() * 4)
+                    bands.append(QImage(data, size.width(), rect.height(), size.width() * 4, pixelFormat).copy())
+
+    return bands
+
+# Decoded Pixels Of Images Without Region Decoding, Capped On Disk
+PIXELS_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Only One Loader Decodes An Image, Others Wait For Its Pixel File
+pixelsLock = threading.Lock()
+
+def decodePixels(imageLocation, reader):
+    stat = os.stat(imageLocation)
+    pixelsFolder = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "PhotoManager", "pixels")
+    pixelsLocation = os.path.join(pixelsFolder, hashlib.sha1(("%s|%d|%d" % (imageLocation, stat.st_mtime_ns, stat.st_size)).encode("utf-8")).hexdigest())
+
+    with pixelsLock:
+        if (os.path.exists(pixelsLocation)):
+            os.utime(pixelsLocation)
+            return pixelsLocation
+
+        with monitor.span("decode", path=imageLocation, width=reader.size().width(), height=reader.size().height()):
+            image = reader.read()
+        if (image.isNull()):
+            raise OSError("Could not decode " + imageLocation)
+
+        # Keep 32-Bit Decodes As They Are Rather Than Holding A Converted Copy
+        if (image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied)):
+            image = image.convertToFormat(QImage.Format_ARGB32)
+
+        os.makedirs(pixelsFolder, exist_ok=True)
+        with open(pixelsLocation + ".part", "wb") as pixelsFile:
+            pixelsFile.write(struct.pack("<I", image.format()))
+
+            # Write Straight From The Image's Buffer Without A Second Copy
+            pixels = image.constBits()
+            pixels.setsize(image.sizeInBytes())
+            pixelsFile.write(pixels)
+        os.replace(pixelsLocation + ".part", pixelsLocation)
+        del image
+
+        # Drop The Least Recently Viewed Files Over The Cap
+        entries = sorted(os.scandir(pixelsFolder), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        usedBytes = 0
+        for entry in entries:
+            usedBytes += entry.stat().st_size
+            if (usedBytes > PIXELS_MAX_BYTES and entry.path != pixelsLocation):
+                os.remove(entry.path)
+
+    return pixelsLocation
+
+class PreviewCache():
+
+    def __init__(self, databaseLocation, maxBytes):
+        self.databaseLocation = databaseLocation
+        self.maxBytes = maxBytes
+        self.connections = threading.local()
+        self.writeCount = 0
+
+        try:
+            os.makedirs(os.path.dirname(databaseLocation), exist_ok=True)
+            connection = self.connection()
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS previews (path TEXT, width INTEGER, mtime INTEGER, size INTEGER, used REAL, bytes INTEGER, data BLOB, PRIMARY KEY (path, width))")
+            connection.execute("CREATE INDEX IF NOT EXISTS previews_used ON previews (used)")
+            connection.commit()
+            self.enabled = True
+        except (OSError, sqlite3.Error):
+            self.enabled = False
+
+    def connection(self):
+
+        # SQLite Connections Cannot Be Shared Between Threads
+        if (not hasattr(self.connections, "connection")):
+            self.connections.connection = sqlite3.connect(self.databaseLocation, timeout=5)
+        return self.connections.connection
+
+    def load(self, imageLocation, imageWidth):
+        if (not self.enabled):
+            return readScaledImage(imageLocation, imageWidth)
+
+        try:
+            stat = os.stat(imageLocation)
+        except OSError:
+            return QImage()
+
+        image = self.get(imageLocation, imageWidth, stat)
+        if (image is None):
+            image = readScaledImage(imageLocation, imageWidth)
+            if (not image.isNull()):
+                self.put(imageLocation, imageWidth, stat, image)
+
+        return image
+
+    def get(self, imageLocation, imageWidth, stat):
+        try:
+            with monitor.span("previewRead", path=imageLocation):
+                connection = self.connection()
+                row = connection.execute("SELECT data FROM previews WHERE path = ? AND width = ? AND mtime = ? AND size = ?", (imageLocation, imageWidth, stat.st_mtime_ns, stat.st_size)).fetchone()
+                if (row is None):
+                    return None
+                connection.execute("UPDATE previews SET used = ? WHERE path = ? AND width = ?", (time.time(), imageLocation, imageWidth))
+                connection.commit()
+        except sqlite3.Error:
+            return None
+
+        with monitor.span("decode", path=imageLocation, preview=True):
+            image = QImage.fromData(row[0])
+        if (image.isNull()):
+            return None
+        return image
+
+    def put(self, imageLocation, imageWidth, stat, image):
+
+        # Keep Transparency For PNGs, Otherwise Store Compact JPEGs
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        if (image.hasAlphaChannel()):
+            image.save(buffer, "PNG")
+        else:
+            image.save(buffer, "JPG", 90)
+        buffer.close()
+
+        try:
+            connection = self.connection()
+            connection.execute("INSERT OR REPLACE INTO previews VALUES (?, ?, ?, ?, ?, ?, ?)", (imageLocation, imageWidth, stat.st_mtime_ns, stat.st_size, time.time(), data.size(), sqlite3.Binary(bytes(data))))
+            connection.commit()
+
+            # Check The Size Cap Every So Often
+            self.writeCount += 1
+            if (self.writeCount % 50 == 0):
+                self.evict(connection)
+        except sqlite3.Error:
+            pass
+
+    def evict(self, connection):
+        usedBytes = connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM previews").fetchone()[0]
+        if (usedBytes <= self.maxBytes):
+            return
+
+        # Drop Least Recently Used Previews Until Under Budget
+        staleRows = []
+        for rowId, rowBytes in connection.execute("SELECT rowid, bytes FROM previews ORDER BY used"):
+            if (usedBytes <= self.maxBytes):
+                break
+            staleRows.append((rowId,))
+            usedBytes -= rowBytes
+
+        connection.executemany("DELETE FROM previews WHERE rowid = ?", staleRows)
+        connection.commit()
+
+    def clear(self):
+        if (not self.enabled):
+            return
+
+        try:
+            connection = self.connection()
+            connection.execute("DELETE FROM previews")
+            connection.commit()
+            connection.execute("VACUUM")
+        except sqlite3.Error:
+            pass
+
+def imageHash(imageLocation):
+
+    # Difference Hash Of A 9x8 Grayscale Thumbnail, Files Moved Or Deleted Since The Scan Have None
+    try:
+        image = readScaledImage(imageLocation, 64)
+    except OSError:
+        return imageLocation, None
+    if (image.isNull()):
+        return imageLocation, None
+
+    image = image.scaled(9, 8, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    value = 0
+    for y in range(8):
+        for x in range(8):
+            value = (value << 1) | int(qGray(image.pixel(x, y)) > qGray(image.pixel(x + 1, y)))
+
+    return imageLocation, value
+
+def exportImage(imageLocation, exportFolder, imageWidths, quality=85):
+    stat = os.stat(imageLocation)
+    name = os.path.basename(imageLocation)
+
+    # JPEGs Keep Their Name, Others Keep Their Extension Too So IMG_1.png & IMG_1.tif Don't Collide
+    if (os.path.splitext(name)[1].lower() not in (".jpg", ".jpeg")):
+        name += ".jpg"
+    outputs = sorted(((width, os.path.join(exportFolder, str(width), name)) for width in imageWidths), reverse=True)
+
+    # Exports Carry Their Source's Modified Time, So Unchanged Ones Are Skipped
+    try:
+        if (all(os.stat(output).st_mtime_ns == stat.st_mtime_ns for width, output in outputs)):
+            return imageLocation, 0
+    except OSError:
+        pass
+
+    with monitor.span("export", path=imageLocation, sizes=len(outputs)):
+
+        # Decode Once At The Largest Size, Never Enlarging Past The Original
+        image = readScaledImage(imageLocation, min(outputs[0][0], imageDisplaySize(imageLocation).width()))
+        if (image.isNull()):
+            raise OSError("Could not decode " + imageLocation)
+
+        for width, output in outputs:
+            if (width < image.width()):
+                image = image.scaledToWidth(width, mode=Qt.SmoothTransformation)
+
+            # Write Beside The Target So A Partial Export Is Never Mistaken For A Finished One
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            if (not image.save(output + ".part", "JPG", quality)):
+                raise OSError("Could not write " + output)
+            os.replace(output + ".part", output)
+            os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    return imageLocation, len(outputs)
+
+class ImageCache():
+
+    def __init__(self, maxBytes):
+        self.maxBytes = maxBytes
+        self.usedBytes = 0
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        if (key in self.entries):
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        return None
+
+    def put(self, key, pixmap):
+        if (key in self.entries):
+            self.usedBytes -= self.pixmapBytes(self.entries.pop(key))
+
+        self.entries[key] = pixmap
+        self.usedBytes += self.pixmapBytes(pixmap)
+
+        # Evict Least Recently Used Images Until Under Budget
+        while (self.usedBytes > self.maxBytes and len(self.entries) > 1):
+            oldKey, oldPixmap = self.entries.popitem(last=False)
+            self.usedBytes -= self.pixmapBytes(oldPixmap)
+
+    def contains(self, key):
+        return key in self.entries
+
+    def clear(self):
+        self.entries.clear()
+        self.usedBytes = 0
+
+    def pixmapBytes(self, pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+class ImageLoaderSignals(QObject):
+    loaded = pyqtSignal(str, int, QImage)
+
+class ImageLoader(QRunnable):
+
+    def __init__(self, imageLocation, imageWidth, previewCache):
+        super().__init__()
+        self.imageLocation = imageLocation
+        self.imageWidth = imageWidth
+        self.previewCache = previewCache
+        self.signals = ImageLoaderSignals()
+
+    def run(self):
+
+        # Decode & Scale Off The GUI Thread
+        image = self.previewCache.load(self.imageLocation, self.imageWidth)
+
+        self.signals.loaded.emit(self.imageLocation, self.imageWidth, image)
+
+class ImageScannerSignals(QObject):
+    found = pyqtSignal(int, list)
+    ordered = pyqtSignal(int, list)
+    finished = pyqtSignal(int, int)
+
+class ImageScanner(QRunnable):
+
+    def __init__(self, scanId, folderName, recursive, captureIndex=None):
+        super().__init__()
+        self.scanId = scanId
+        self.folderName = folderName
+        self.recursive = recursive
+        self.captureIndex = captureIndex
+        self.cancelled = False
+        self.signals = ImageScannerSignals()
+
+    def run(self):
+        batch = []
+        batchSize = 1
+        count = 0
+        images = []
+        startTime = time.perf_counter()
+
+        for image in scanImages(self.folderName, self.recursive):
+            if (self.cancelled):
+                return
+
+            images.append(image)
+            batch.append(image)
+            count += 1
+            if (count == 1):
+                monitor.record("scanFirstImage", time.perf_counter() - startTime, {"folder": self.folderName})
+
+            # Stream Results In Growing Batches So The First Image Arrives Immediately
+            if (len(batch) >= batchSize):
+                self.signals.found.emit(self.scanId, batch)
+                batch = []
+                batchSize = min(batchSize * 2, 512)
+
+        if (len(batch) > 0):
+            self.signals.found.emit(self.scanId, batch)
+
+        monitor.record("scan", time.perf_counter() - startTime, {"folder": self.folderName, "images": count})
+
+        # Capture Order Needs The Whole Listing, So It Follows The Streamed Images
+        if (self.captureIndex is not None and count > 1):
+            images = sortByCaptureTime(images, self.captureIndex)
+            if (self.cancelled):
+                return
+            self.signals.ordered.emit(self.scanId, images)
+
+        self.signals.finished.emit(self.scanId, count)
+
+class FolderListerSignals(QObject):
+    listed = pyqtSignal(int, list)
+
+class FolderLister(QRunnable):
+
+    def __init__(self, watchId, folders, listings):
+        super().__init__()
+        self.watchId = watchId
+        self.folders = folders
+        self.listings = listings
+        self.signals = FolderListerSignals()
+
+    def run(self):
+        images = []
+        for folderName in sorted(self.folders):
+            listing = set(iterFolder(folderName))
+
+            # Only Post Files That Weren't In The Folder's Last Listing
+            previous = self.listings.get(folderName, set())
+            images.extend(image for image in listing if image not in previous)
+            self.listings[folderName] = listing
+
+        self.signals.listed.emit(self.watchId, images)
+
+class TileLoaderSignals(QObject):
+    loaded = pyqtSignal(str, int, list)
+
+class TileLoader(QRunnable):
+
+    def __init__(self, imageLocation, imageSize, bandIndexes):
+        super().__init__()
+        self.imageLocation = imageLocation
+        self.imageSize = imageSize
+        self.bandIndexes = bandIndexes
+        self.signals = TileLoaderSignals()
+
+    def run(self):
+        bandRects = []
+        for bandIndex in self.bandIndexes:
+            top = bandIndex * TILE_SIZE
+            bandRects.append(QRect(0, top, self.imageSize.width(), min(TILE_SIZE, self.imageSize.height() - top)))
+
+        try:
+            bands = readImageBands(self.imageLocation, bandRects)
+        except OSError:
+            bands = [QImage() for rect in bandRects]
+
+        # Cut Each Decoded Row Into Tiles
+        for bandIndex, band in zip(self.bandIndexes, bands):
+            tiles = []
+            if (not band.isNull()):
+                for left in range(0, band.width(), TILE_SIZE):
+                    tiles.append(band.copy(left, 0, min(TILE_SIZE, band.width() - left), band.height()))
+            self.signals.loaded.emit(self.imageLocation, bandIndex, tiles)
+
+class SimilarImageFinderSignals(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, dict, list)
+
+class SimilarImageFinder(QRunnable):
+
+    def __init__(self, scanId, images, hashes):
+        super().__init__()
+        self.scanId = scanId
+        self.images = images
+        self.hashes = hashes
+        self.signals = SimilarImageFinderSignals()
+
+    def run(self):
+        hashes = dict(self.hashes)
+        remaining = [image for image in self.images if image not in hashes]
+
+        # Hash In Separate Processes So Every Core Is Used
+        try:
+            if (len(remaining) > 0):
+                with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as executor:
+                    for done, (image, value) in enumerate(executor.map(imageHash, remaining, chunksize=16), 1):
+                        hashes[image] = value
+                        if (done % 16 == 0 or done == len(remaining)):
+                            self.signals.progress.emit(done, len(remaining))
+
+        # Fall Back To This Thread If Processes Cannot Be Started
+        except (OSError, RuntimeError, BrokenProcessPool):
+            for image in remaining:
+                if (image not in hashes):
+                    hashes[image] = imageHash(image)[1]
+
+        self.signals.finished.emit(self.scanId, hashes, groupSimilarImages(self.images, hashes))
+
+class ImageExporterSignals(QObject):
+    exported = pyqtSignal(str, int, str)
+
+class ImageExporter(QRunnable):
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = queue.Queue()
+        self.pending = set()
+        self.cancelled = False
+        self.signals = ImageExporterSignals()
+
+    def add(self, imageLocation, exportFolder, imageWidths):
+        self.jobs.put((imageLocation, exportFolder, imageWidths))
+
+    def stop(self):
+        self.cancelled = True
+        self.jobs.put(None)
+
+    def run(self):
+
+        # One Pool Of Processes Serves Every Export For The Session
+        try:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, RuntimeError):
+            executor = None
+
+        while True:
+            job = self.jobs.get()
+            if (job is None or self.cancelled):
+                break
+
+            if (executor is not None):
+                try:
+                    future = executor.submit(exportImage, *job)
+                    self.pending.add(future)
+                    future.add_done_callback(lambda future, job=job: self.jobDone(future, job))
+                    continue
+
+                # Fall Back To This Thread If Processes Cannot Be Started
+                except (OSError, RuntimeError, BrokenProcessPool):
+                    executor.shutdown(wait=False)
+                    executor = None
+
+            self.exportJob(job)
+
+        if (executor is not None):
+            for future in list(self.pending):
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def jobDone(self, future, job):
+        self.pending.discard(future)
+        if (future.cancelled()):
+            return
+
+        # A Dead Worker Breaks The Pool, So Its Image Is Redone In This Thread
+        error = future.exception()
+        if (isinstance(error, BrokenProcessPool)):
+            self.jobs.put(job)
+        elif (error is not None):
+            self.signals.exported.emit(job[0], 0, str(error))
+        else:
+            self.signals.exported.emit(job[0], future.result()[1], "")
+
+    def exportJob(self, job):
+        try:
+            self.signals.exported.emit(job[0], exportImage(*job)[1], "")
+        except OSError as e:
+            self.signals.exported.emit(job[0], 0, str(e))
+
+class TransferSignals(QObject):
+    finished = pyqtSignal(str, str, str)
+
+class TransferWorker(QRunnable):
+
+    def __init__(self, source, destination, mode, overwrite=False):
+        super().__init__()
+        self.source = source
+        self.destination = destination
+        self.mode = mode
+        self.overwrite = overwrite
+        self.signals = TransferSignals()
+
+    def run(self):
+        error = ""
+        try:
+            transferFile(self.source, self.destination, self.mode, self.overwrite)
+        except OSError as e:
+            error = str(e)
+
+        self.signals.finished.emit(self.source, self.destination, error)
+
+class ImageLabel(QLabel):
+
+    def paintEvent(self, event):
+        with monitor.span("paint"):
+            super().paintEvent(event)
+
+class TileViewer(QAbstractScrollArea):
+
+    def __init__(self, tileCache, threadPool):
+        super().__init__()
+        self.tileCache = tileCache
+        self.threadPool = threadPool
+        self.imageLocation = ""
+        self.imageSize = QSize()
+        self.preview = None
+        self.pendingBands = {}
+        self.dragStart = None
+
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+
+    def setImage(self, imageLocation, preview):
+
+        # Rows Already Loading For The Previous Image Are Ignored When They Arrive
+        self.cancelBands(set())
+        self.pendingBands = {}
+        self.imageLocation = imageLocation
+        self.imageSize = imageDisplaySize(imageLocation)
+        self.preview = preview
+        self.updateScrollBars()
+
+        # Start In The Middle Of The Image
+        self.horizontalScrollBar().setValue(self.horizontalScrollBar().maximum() // 2)
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum() // 2)
+        self.viewport().update()
+
+    def updateScrollBars(self):
+        viewportSize = self.viewport().size()
+        self.horizontalScrollBar().setRange(0, max(0, self.imageSize.width() - viewportSize.width()))
+        self.verticalScrollBar().setRange(0, max(0, self.imageSize.height() - viewportSize.height()))
+        self.horizontalScrollBar().setPageStep(viewportSize.width())
+        self.verticalScrollBar().setPageStep(viewportSize.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.updateScrollBars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(self.viewport().rect(), QColor(40, 40, 40))
+        if (not self.imageSize.isValid() or self.imageSize.isEmpty()):
+            return
+
+        # Centre Images Smaller Than The Window
+        viewportSize = self.viewport().size()
+        left = self.horizontalScrollBar().value() - max(0, (viewportSize.width() - self.imageSize.width()) // 2)
+        top = self.verticalScrollBar().value() - max(0, (viewportSize.height() - self.imageSize.height()) // 2)
+
+        firstColumn = max(0, left // TILE_SIZE)
+        lastColumn = min((self.imageSize.width() - 1) // TILE_SIZE, (left + viewportSize.width()) // TILE_SIZE)
+        firstBand = max(0, top // TILE_SIZE)
+        lastBand = min((self.imageSize.height() - 1) // TILE_SIZE, (top + viewportSize.height()) // TILE_SIZE)
+
+        missingBands = []
+        with monitor.span("paintTiles"):
+            for band in range(firstBand, lastBand + 1):
+                for column in range(firstColumn, lastColumn + 1):
+                    tileRect = QRect(column * TILE_SIZE, band * TILE_SIZE, TILE_SIZE, TILE_SIZE).intersected(QRect(QPoint(0, 0), self.imageSize))
+                    target = tileRect.translated(-left, -top)
+                    tile = self.tileCache.get((self.imageLocation, column, band))
+                    if (tile is not None):
+                        painter.drawPixmap(target, tile)
+                    else:
+
+                        # Stretch The Scaled Preview Until The Tile Arrives
+                        if (self.preview is not None and not self.preview.isNull()):
+                            scale = self.preview.width() / self.imageSize.width()
+                            painter.drawPixmap(QRectF(target), self.preview, QRectF(tileRect.x() * scale, tileRect.y() * scale, tileRect.width() * scale, tileRect.height() * scale))
+                        if (band not in missingBands):
+                            missingBands.append(band)
+        painter.end()
+
+        # Only Visible Rows Stay Queued
+        self.cancelBands(set(range(firstBand, lastBand + 1)))
+        missingBands = [band for band in missingBands if band not in self.pendingBands]
+        if (len(missingBands) > 0):
+            loader = TileLoader(self.imageLocation, self.imageSize, missingBands)
+            loader.setAutoDelete(False)
+            loader.signals.loaded.connect(self.bandLoaded)
+            for band in missingBands:
+                self.pendingBands[band] = loader
+            self.threadPool.start(loader)
+
+    def cancelBands(self, wanted):
+        for band, loader in list(self.pendingBands.items()):
+            if (band not in wanted and self.threadPool.tryTake(loader)):
+                for loaderBand in loader.bandIndexes:
+                    self.pendingBands.pop(loaderBand, None)
+
+    def bandLoaded(self, imageLocation, band, tiles):
+        if (imageLocation != self.imageLocation):
+            return
+
+        self.pendingBands.pop(band, None)
+        for column, tile in enumerate(tiles):
+            self.tileCache.put((imageLocation, column, band), QPixmap.fromImage(tile))
+        self.viewport().update()
+
+    def mousePressEvent(self, event):
+        self.dragStart = (event.pos(), self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+        self.viewport().setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if (self.dragStart is not None):
+            position, horizontal, vertical = self.dragStart
+            self.horizontalScrollBar().setValue(horizontal - (event.pos().x() - position.x()))
+            self.verticalScrollBar().setValue(vertical - (event.pos().y() - position.y()))
+
+    def mouseReleaseEvent(self, event):
+        self.dragStart = None
+        self.viewport().unsetCursor()
+
+class ImageGridModel(QAbstractListModel):
+
+    def __init__(self, images, decisions, thumbnailProvider):
+        super().__init__()
+        self.images = images
+        self.decisions = decisions
+        self.thumbnailProvider = thumbnailProvider
+        self.shownRows = len(images)
+
+    def rowCount(self, parent=QModelIndex()):
+        if (parent.isValid()):
+            return 0
+        return self.shownRows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if (not index.isValid() or index.row() >= self.shownRows):
+            return None
+
+        imageLocation = self.images[index.row()]
+        if (role == Qt.DisplayRole):
+            return os.path.basename(imageLocation)
+        elif (role == Qt.ToolTipRole):
+            return imageLocation
+        elif (role == Qt.DecorationRole):
+
+            # Only Called For Visible Cells, So Thumbnails Load Lazily
+            return self.thumbnailProvider(imageLocation)
+        elif (role == Qt.BackgroundRole):
+            decision = self.decisions.get(imageLocation)
+            if (decision == "Keep"):
+                return QColor(200, 240, 200)
+            elif (decision == "Discard"):
+                return QColor(240, 200, 200)
+        return None
+
+    def setImages(self, images, decisions):
+        self.beginResetModel()
+        self.images = images
+        self.decisions = decisions
+        self.shownRows = len(images)
+        self.endResetModel()
+
+    def imagesAdded(self):
+        if (len(self.images) > self.shownRows):
+            self.beginInsertRows(QModelIndex(), self.shownRows, len(self.images) - 1)
+            self.shownRows = len(self.images)
+            self.endInsertRows()
+
+    def reorderRows(self, first, images):
+        self.layoutAboutToBeChanged.emit()
+
+        # Move Selections & Other Persistent Indexes Along With Their Images
+        oldIndexes = self.persistentIndexList()
+        oldImages = [self.images[index.row()] for index in oldIndexes]
+        self.images[first:] = images
+        rows = {image: row for row, image in enumerate(self.images)}
+        self.changePersistentIndexList(oldIndexes, [self.index(rows[image]) for image in oldImages])
+
+        self.layoutChanged.emit()
+
+    def rowChanged(self, row):
+        if (row < self.shownRows):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
 class PhotoCollectorMain(QMainWindow):
     
     def __init__(self):
@@ -36,6 +1569,86 @@ class PhotoCollectorMain(QMainWindow):
         self.imageWidth = 400
         self.saveLocation = ""
 
+        # Init Prefetch Engine
+        self.prefetchAhead = 5
+        self.prefetchBehind = 2
+        self.imageCache = ImageCache(256 * 1024 * 1024)
+        self.previewCache = PreviewCache(os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "PhotoManager", "previews.sqlite"), 1024 * 1024 * 1024)
+        self.captureIndex = CaptureTimeIndex(os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation), "PhotoManager", "captureTimes.sqlite"))
+        self.sortByCaptureTime = True
+        self.pendingImages = set()
+        self.threadPool = QThreadPool()
+        self.threadPool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+
+        # Init Transfer Queue
+        self.transferMode = "Copy"
+        self.pendingTransfers = 0
+        self.transferPool = QThreadPool()
+        self.transferPool.setMaxThreadCount(2)
+
+        # Init Image Scanner
+        self.scanId = 0
+        self.scanner = None
+        self.scanRunning = False
+        self.scanSubfolders = False
+        self.waitingForImages = False
+        self.knownImages = {}
+        self.decisions = {}
+        self.destinations = set()
+
+        # Init Grid View Thumbnails
+        self.gridMode = False
+        self.thumbnailWidth = 160
+        self.thumbnailMargin = 2
+        self.thumbnailCache = ImageCache(64 * 1024 * 1024)
+        self.pendingThumbnails = {}
+
+        # Init Actual Size Viewer
+        self.tileCache = ImageCache(128 * 1024 * 1024)
+        self.zoomWindow = None
+
+        # Init Folder Watcher
+        self.sourceFolder = ""
+        self.watchFolder = False
+        self.watching = False
+        self.changedFolders = set()
+        self.pendingFiles = {}
+        self.watchId = 0
+        self.folderLister = None
+        self.folderListings = {}
+        self.folderWatcher = QFileSystemWatcher(self)
+        self.folderWatcher.directoryChanged.connect(self.folderChanged)
+
+        # Wait For Bursts Of Changes To Settle Before Listing
+        self.watchTimer = QTimer(self)
+        self.watchTimer.setSingleShot(True)
+        self.watchTimer.setInterval(500)
+        self.watchTimer.timeout.connect(self.checkChangedFolders)
+
+        # Poll New Files Until Their Size Stops Changing
+        self.stableTimer = QTimer(self)
+        self.stableTimer.setInterval(1000)
+        self.stableTimer.timeout.connect(self.checkPendingFiles)
+
+        # Init Decision Journal
+        self.journal = None
+
+        # Init Similar Image Finder
+        self.imageHashes = {}
+        self.similarImageFinder = None
+        self.similarImagesWindow = None
+
+        # Init Exporter
+        self.exportWhileKeeping = False
+        self.exportWidths = [2048, 1024]
+        self.imageExporter = None
+        self.exportCounts = {"total": 0, "exported": 0, "skipped": 0}
+        self.exportFailures = []
+
+        # Exports Wait On Their Processes, So Keep Them Off Qt's Shared Pool
+        self.exportPool = QThreadPool()
+        self.exportPool.setMaxThreadCount(1)
+
         # Check If Windows Because The Menubar Takes Up Extra Space
         if (platform.system() == 'Windows'):
             self.modifier = 40
@@ -61,6 +1674,32 @@ class PhotoCollectorMain(QMainWindow):
         loadAction.triggered.connect(self.loadImages)
         fileMenu.addAction(loadAction)
 
+        # Include Subfolders Action
+        subfoldersAction = QAction('Include Subfolders', self, checkable=True)
+        subfoldersAction.triggered.connect(self.setScanSubfolders)
+        fileMenu.addAction(subfoldersAction)
+
+        # Capture Time Order Action
+        captureOrderAction = QAction('Sort By Capture Time', self, checkable=True)
+        captureOrderAction.setChecked(True)
+        captureOrderAction.triggered.connect(self.setSortByCaptureTime)
+        fileMenu.addAction(captureOrderAction)
+
+        # Watch Folder Action
+        watchAction = QAction('Watch Folder For New Images', self, checkable=True)
+        watchAction.triggered.connect(self.setWatchFolder)
+        fileMenu.addAction(watchAction)
+
+        # Clear Preview Cache Action
+        clearCacheAction = QAction('Clear Preview Cache', self)
+        clearCacheAction.triggered.connect(self.clearPreviewCache)
+        fileMenu.addAction(clearCacheAction)
+
+        # Performance Log Action
+        self.performanceLogAction = QAction('Start Performance Log', self)
+        self.performanceLogAction.triggered.connect(self.togglePerformanceLog)
+        fileMenu.addAction(self.performanceLogAction)
+
         # Open Information Action
         prefAction = QAction('About Photo Manager', self)
         prefAction.triggered.connect(self.openAbout)
@@ -82,6 +1721,12 @@ class PhotoCollectorMain(QMainWindow):
         self.discardAction.triggered.connect(self.discardImage)
         actionMenu.addAction(self.discardAction)
 
+        # Find Similar Images Action
+        self.similarAction = QAction('Find Similar Images', self)
+        self.similarAction.setShortcut("Ctrl+F")
+        self.similarAction.triggered.connect(self.findSimilarImages)
+        actionMenu.addAction(self.similarAction)
+
         # Init Action Menu
         imageMenu = menubar.addMenu('Image')
 
@@ -115,6 +1760,54 @@ class PhotoCollectorMain(QMainWindow):
         self.twelveHundredAction.triggered.connect(self.adjustFrameTwelveHundred)
         imageMenu.addAction(self.twelveHundredAction)
 
+        # Performance Overlay Action
+        performanceAction = QAction('Performance Overlay', self, checkable=True)
+        performanceAction.setShortcut("Ctrl+P")
+        performanceAction.toggled.connect(self.setPerformanceOverlay)
+        imageMenu.addAction(performanceAction)
+
+        # Actual Size Action
+        self.zoomAction = QAction('View At Actual Size', self)
+        self.zoomAction.setShortcut("Ctrl+0")
+        self.zoomAction.triggered.connect(self.openZoom)
+        imageMenu.addAction(self.zoomAction)
+
+        # Grid View Action
+        self.gridAction = QAction('Grid View', self, checkable=True)
+        self.gridAction.setShortcut("Ctrl+G")
+        self.gridAction.toggled.connect(self.setGridMode)
+        imageMenu.addAction(self.gridAction)
+
+        # Init Transfer Menu
+        transferMenu = menubar.addMenu('Transfer')
+        transferGroup = QActionGroup(self)
+
+        # Transfer Mode Actions
+        for mode in TRANSFER_MODES:
+            modeAction = QAction(mode + ' Files', self, checkable=True)
+            modeAction.setChecked(mode == self.transferMode)
+            modeAction.triggered.connect(lambda checked, mode=mode: self.setTransferMode(mode))
+            transferGroup.addAction(modeAction)
+            transferMenu.addAction(modeAction)
+
+        transferMenu.addSeparator()
+
+        # Export Actions
+        self.exportAction = QAction('Export Kept Images', self)
+        self.exportAction.triggered.connect(self.exportKeptImages)
+        transferMenu.addAction(self.exportAction)
+
+        exportWhileKeepingAction = QAction('Export While Keeping', self, checkable=True)
+        exportWhileKeepingAction.triggered.connect(self.setExportWhileKeeping)
+        transferMenu.addAction(exportWhileKeepingAction)
+
+        exportSizesAction = QAction('Export Sizes...', self)
+        exportSizesAction.triggered.connect(self.setExportWidths)
+        transferMenu.addAction(exportSizesAction)
+
+        # Init Status Bar For Transfer Progress
+        self.statusBar().setSizeGripEnabled(False)
+
         # Disable Button Until Image Load
         self.disableMenuItems()
 
@@ -130,7 +1823,41 @@ class PhotoCollectorMain(QMainWindow):
         self.setCentralWidget(centralWidget)
 
         # Image Window
-        self.imageLabel = QLabel(centralWidget)
+        self.imageLabel = ImageLabel(centralWidget)
+
+        # Grid View For Bulk Culling
+        self.gridModel = ImageGridModel(self.allImages, self.decisions, self.gridThumbnail)
+        self.gridView = QListView(centralWidget)
+        self.gridView.setModel(self.gridModel)
+        self.gridView.setViewMode(QListView.IconMode)
+        self.gridView.setResizeMode(QListView.Adjust)
+        self.gridView.setMovement(QListView.Static)
+        self.gridView.setUniformItemSizes(True)
+        self.gridView.setLayoutMode(QListView.Batched)
+        self.gridView.setBatchSize(500)
+        self.gridView.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.gridView.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.gridView.setIconSize(QSize(self.thumbnailWidth, self.thumbnailWidth * 3 // 4))
+        self.gridView.setGridSize(QSize(self.thumbnailWidth + 16, self.thumbnailWidth * 3 // 4 + 32))
+        self.gridView.doubleClicked.connect(self.openGridImage)
+        self.gridView.setVisible(False)
+
+        # Queue Thumbnails Near The Viewport Once Scrolling Settles
+        self.thumbnailTimer = QTimer(self)
+        self.thumbnailTimer.setSingleShot(True)
+        self.thumbnailTimer.setInterval(100)
+        self.thumbnailTimer.timeout.connect(self.updateThumbnails)
+        self.gridView.verticalScrollBar().valueChanged.connect(self.thumbnailTimer.start)
+
+        # Performance Overlay
+        self.performanceLabel = QLabel(centralWidget)
+        self.performanceLabel.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.performanceLabel.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; padding: 4px;")
+        self.performanceLabel.setVisible(False)
+
+        self.performanceTimer = QTimer(self)
+        self.performanceTimer.setInterval(500)
+        self.performanceTimer.timeout.connect(self.updatePerformanceOverlay)
 
         # Open Folder Text Label
         self.loadLabel = QLabel(centralWidget)
@@ -150,6 +1877,11 @@ class PhotoCollectorMain(QMainWindow):
         else:
             self.loadLabel.move(215, 125)
 
+        # Start The Performance Log Straight Away When Asked To By The Environment
+        if (os.environ.get("PHOTOMANAGER_PERF_LOG")):
+            monitor.startLog(os.environ["PHOTOMANAGER_PERF_LOG"])
+            self.performanceLogAction.setText('Stop Performance Log')
+
         # Init Window Settings
         self.centerWindow()
         self.setWindowTitle('Photo Manager')    
@@ -166,83 +1898,311 @@ class PhotoCollectorMain(QMainWindow):
         # Check If Folder Was Selected
         if (folderName != ""):
 
-            # Collect Image Names
-            self.allImages = []
+            # Finish The Current Session So New Images Never Reach Its Journal Or Destination
+            if (self.saveLocation != ""):
+                self.endSession()
 
-            # Collect JPEGs
-            jpegs = glob.glob(folderName + "/*.jpeg")
-            for image in jpegs:
-                self.allImages.append(image)
+            # Start Collecting Image Names While The Destination Is Chosen
+            self.startScan(folderName)
 
-            # Collect JPEGs
-            jpegs = glob.glob(folderName + "/*.JPEG")
-            for image in jpegs:
-                self.allImages.append(image)
+            # Show Info
+            QMessageBox.information(self, 'Choose Destination', "In The Next Window, Please Choose Where To Save The Sorted Photos.", QMessageBox.Ok)
+            
+            # Open File Dialog
+            destinationName = QFileDialog.getExistingDirectory(self, 'Open Destination Folder')
 
-            # Collect JPGs
-            jpgs = glob.glob(folderName + "/*.jpg")
-            for image in jpgs:
-                self.allImages.append(image)
+            # Check If Folder Was Selected
+            if (destinationName == ""):
+                self.stopScan()
 
-            # Collect JPGs
-            jpgs = glob.glob(folderName + "/*.JPG")
-            for image in jpgs:
-                self.allImages.append(image)
+            # Resume An Interrupted Session
+            elif (os.path.exists(destinationName + "/" + JOURNAL_NAME)):
+                self.resumeSession(folderName, destinationName)
 
-            # Collect PNGs
-            pngs = glob.glob(folderName + "/*.png")
-            for image in pngs:
-                self.allImages.append(image)
+            # Check If Any Images Were Found
+            elif (not self.scanRunning and len(self.allImages) == 0 and not self.watchFolder):
+                QMessageBox.information(self, 'No Images Found', "No Images Found in Folder", QMessageBox.Ok)
 
-            # Collect PNGs
-            pngs = glob.glob(folderName + "/*.PNG")
-            for image in pngs:
-                self.allImages.append(image)
+            # Create Folders
+            elif(os.path.exists(destinationName + "/Keep") or os.path.exists(destinationName + "/Discard")):
+                self.stopScan()
+                QMessageBox.information(self, 'Save Location Already Exists', "Please Delete The 'Keep' and 'Discard' Directories To Continue.", QMessageBox.Ok)
+            else:
 
-            if (len(self.allImages) > 0):
+                # Set Save Location
+                self.saveLocation = destinationName
+
+                # Create Save Directories
+                os.makedirs(destinationName + "/Keep")
+                os.makedirs(destinationName + "/Discard")
+
+                # Start Journaling Decisions
+                self.closeJournal()
+                self.journal = DecisionJournal(destinationName + "/" + JOURNAL_NAME)
+                self.journal.write({"event": "session", "source": folderName})
+                if (len(self.allImages) > 0):
+                    self.journal.write({"event": "found", "images": self.allImages})
+                if (not self.scanRunning):
+                    self.journal.write({"event": "scanned"})
+
+                # Load Image Into Window, Or Wait For The Scanner To Find One
+                self.currentPosition = 0
+                self.imageCache.clear()
+                if (self.watchFolder):
+                    self.startWatching()
+                if (len(self.allImages) > 0):
+                    self.showCurrentImage()
+                else:
+                    self.waitingForImages = True
+
+    def resumeSession(self, folderName, destinationName):
+        session = readJournal(destinationName + "/" + JOURNAL_NAME)
+
+        if (os.path.normpath(session["source"]) != os.path.normpath(folderName)):
+            self.stopScan()
+            QMessageBox.information(self, 'Different Source Folder', "This Destination Was Sorted From " + session["source"] + ". Please Choose That Folder To Resume.", QMessageBox.Ok)
+            return
+
+        # Reuse The Journaled Image List Instead Of Rescanning
+        scannedImages = self.allImages
+        if (session["scanned"]):
+            self.stopScan()
+        self.clearImages()
+        self.addImages(session["images"])
+        newImages = [] if session["scanned"] else self.addImages(scannedImages)
+        for image, (destination, mode) in session["decisions"].items():
+            self.decisions[image] = os.path.basename(os.path.dirname(destination))
+            self.destinations.add(destination)
+
+        # Set Save Location
+        self.saveLocation = destinationName
+        os.makedirs(destinationName + "/Keep", exist_ok=True)
+        os.makedirs(destinationName + "/Discard", exist_ok=True)
+
+        self.closeJournal()
+        self.journal = DecisionJournal(destinationName + "/" + JOURNAL_NAME)
+        if (len(newImages) > 0):
+            self.journal.write({"event": "found", "images": newImages})
+        if (not session["scanned"] and not self.scanRunning):
+            self.journal.write({"event": "scanned"})
+
+        # Re-Queue Transfers That Did Not Finish, Replacing Any Partial Copy
+        for image, (destination, mode) in session["decisions"].items():
+            if (image not in session["transferred"]):
+                if (mode == "Move" and not os.path.exists(image) and os.path.exists(destination)):
+                    self.journal.write({"event": "transferred", "image": image})
+                else:
+                    self.startTransfer(image, destination, mode, True)
+
+        # Skip To The First Undecided Image
+        self.imageCache.clear()
+        if (self.watchFolder):
+            self.startWatching()
+        if (len(self.decisions) > 0 and len(self.decisions) >= len(self.allImages) and not self.scanRunning and not self.watching):
+            QMessageBox.information(self, 'End of Images', "All Images In This Folder Have Already Been Sorted.", QMessageBox.Ok)
+            self.resetMainWindow()
+        else:
+            self.loadLabel.setVisible(False)
+            self.showImageAt(0)
+
+    def startScan(self, folderName):
+        self.stopScan()
+        self.stopWatching()
+        self.sourceFolder = folderName
+
+        # Collect Image Names
+        self.clearImages()
+        self.scanId += 1
+        self.scanRunning = True
+        self.waitingForImages = False
+
+        self.scanner = ImageScanner(self.scanId, folderName, self.scanSubfolders, self.captureIndex if self.sortByCaptureTime else None)
+        self.scanner.signals.found.connect(self.imagesFound)
+        self.scanner.signals.ordered.connect(self.imagesOrdered)
+        self.scanner.signals.finished.connect(self.scanFinished)
+        QThreadPool.globalInstance().start(self.scanner)
+
+        self.statusBar().showMessage("Scanning For Images...")
+
+    def stopScan(self):
+        if (self.scanner is not None):
+            self.scanner.cancelled = True
+            self.scanner = None
+
+        self.scanRunning = False
+        self.waitingForImages = False
+
+    def clearImages(self):
+        self.allImages = []
+        self.knownImages = {}
+        self.decisions = {}
+        self.destinations = set()
+        self.imageHashes = {}
+        self.gridModel.setImages(self.allImages, self.decisions)
+
+    def addImages(self, images):
+        newImages = []
+        for image in images:
+            if (image not in self.knownImages):
+                self.knownImages[image] = len(self.allImages)
+                self.allImages.append(image)
+                newImages.append(image)
+
+        if (len(newImages) > 0):
+            self.gridModel.imagesAdded()
+        return newImages
+
+    def imagesFound(self, scanId, images):
+        if (scanId != self.scanId):
+            return
+
+        self.appendImages(images)
+
+    def appendImages(self, images):
+        images = self.addImages(images)
+        if (len(images) == 0):
+            return
+
+        if (self.journal is not None):
+            self.journal.write({"event": "found", "images": images})
+
+        # Show The Image The Window Is Waiting On
+        if (self.waitingForImages):
+            self.waitingForImages = False
+            self.showCurrentImage()
+        elif (self.saveLocation != "" and self.currentPosition + self.prefetchAhead >= len(self.allImages) - len(images)):
+            self.prefetchImages()
+
+    def imagesOrdered(self, scanId, order):
+        if (scanId != self.scanId):
+            return
+
+        # Only Reorder Images That Have Not Been Reached Yet
+        start = self.currentPosition
+        if (self.saveLocation == ""):
+            start = 0
+        elif (not self.waitingForImages):
+            start += 1
+
+        rank = {image: position for position, image in enumerate(order)}
+        tail = sorted(self.allImages[start:], key=lambda image: rank.get(image, len(rank)))
+        self.gridModel.reorderRows(start, tail)
+        for position, image in enumerate(tail, start):
+            self.knownImages[image] = position
+
+        if (self.journal is not None):
+            self.journal.write({"event": "ordered", "images": self.allImages})
+        if (self.saveLocation != "" and not self.waitingForImages and not self.gridMode):
+            self.prefetchImages()
+
+    def scanFinished(self, scanId, count):
+        if (scanId != self.scanId):
+            return
+
+        self.scanner = None
+        self.scanRunning = False
+        self.statusBar().showMessage("Found " + str(count) + " Images", 3000)
+
+        if (self.journal is not None):
+            self.journal.write({"event": "scanned"})
+
+        # Nothing Left To Wait For
+        if (self.waitingForImages and not self.watching):
+            self.waitingForImages = False
+            if (len(self.allImages) == 0):
+                self.closeJournal()
+                os.remove(self.saveLocation + "/" + JOURNAL_NAME)
+                os.rmdir(self.saveLocation + "/Keep")
+                os.rmdir(self.saveLocation + "/Discard")
+                QMessageBox.information(self, 'No Images Found', "No Images Found in Folder", QMessageBox.Ok)
+            else:
+                QMessageBox.information(self, 'End of Images', "End of Images", QMessageBox.Ok)
+            self.resetMainWindow()
 
-                # Show Info
-                QMessageBox.information(self, 'Choose Destination', "In The Next Window, Please Choose Where To Save The Sorted Photos.", QMessageBox.Ok)
-                
-                # Open File Dialog
-                destinationName = QFileDialog.getExistingDirectory(self, 'Open Destination Folder')
+    def showCurrentImage(self):
+        if (not self.gridMode):
+            self.updateImage(self.allImages[self.currentPosition])
 
-                # Check If Folder Was Selected
-                if (destinationName != ""):
+        # Adjust Window Settings
+        self.loadLabel.setVisible(False)
 
-                    # Create Folders
-                    if(os.path.exists(destinationName + "/Keep") or os.path.exists(destinationName + "/Discard")):
-                        QMessageBox.information(self, 'Save Location Already Exists', "Please Delete The 'Keep' and 'Discard' Directories To Continue.", QMessageBox.Ok)
-                    else:
+        # Adjust Menu Settings
+        self.enableMenuItems()
 
-                        # Set Save Location
-                        self.saveLocation = destinationName
+    def nextImage(self):
+        self.showImageAt(self.currentPosition + 1)
 
-                        # Create Save Directories
-                        os.makedirs(destinationName + "/Keep")
-                        os.makedirs(destinationName + "/Discard")
+    def showImageAt(self, position):
 
-                        # Load Image Into Window
-                        self.currentPosition = 0
-                        self.updateImage(self.allImages[self.currentPosition])
+        # Skip Images Already Decided In The Grid
+        while (position < len(self.allImages) and self.allImages[position] in self.decisions):
+            position += 1
 
-                        # Adjust Window Settings
-                        self.loadLabel.setVisible(False)
+        if (position < len(self.allImages)):
+            self.currentPosition = position
+            self.showCurrentImage()
 
-                        # Adjust Menu Settings
-                        self.enableMenuItems()
+        # Wait For The Scanner Or Folder Watcher To Find More Images
+        elif (self.scanRunning or self.watching):
+            self.currentPosition = position
+            self.waitingForImages = True
+            self.imageLabel.clear()
+            self.disableMenuItems()
+            self.statusBar().showMessage("Scanning For More Images..." if self.scanRunning else "Waiting For New Images...")
 
-            else:
-                QMessageBox.information(self, 'No Images Found', "No Images Found in Folder", QMessageBox.Ok)
+        else:
+            QMessageBox.information(self, 'End of Images', "End of Images", QMessageBox.Ok)
+            self.resetMainWindow()
 
     def updateImage(self, imageLocation):
-        self.loadedImage = QPixmap(imageLocation).scaledToWidth(self.imageWidth, mode=Qt.SmoothTransformation)
-        self.imageLabel.setPixmap(self.loadedImage)
-        self.imageLabel.setAlignment(Qt.AlignCenter)
-        self.imageLabel.adjustSize()
-        self.resize(self.imageWidth, self.loadedImage.size().height() + self.modifier)
-        self.imageLabel.move(0, self.modifier)
-        self.centerWindow()
+
+        # Use Prefetched Image If Available
+        self.loadedImage = self.imageCache.get((imageLocation, self.imageWidth))
+        if (self.loadedImage is None):
+            self.loadedImage = QPixmap.fromImage(self.previewCache.load(imageLocation, self.imageWidth))
+            self.imageCache.put((imageLocation, self.imageWidth), self.loadedImage)
+
+        with monitor.span("layout", path=imageLocation):
+            self.imageLabel.setPixmap(self.loadedImage)
+            self.imageLabel.setAlignment(Qt.AlignCenter)
+            self.imageLabel.adjustSize()
+            self.resize(self.imageWidth, self.loadedImage.size().height() + self.modifier + self.statusBar().height())
+            self.imageLabel.move(0, self.modifier)
+            self.centerWindow()
+
+        # Keep The Actual Size Viewer On The Shown Image
+        if (self.zoomWindow is not None and self.zoomWindow.isVisible()):
+            self.zoomWindow.setImage(imageLocation, self.loadedImage)
+
+        # Decode Neighbouring Images In The Background
+        self.prefetchImages()
+
+    def openZoom(self):
+        if (self.zoomWindow is None):
+            self.zoomWindow = ZoomWindow(self.tileCache, self.threadPool)
+
+        self.zoomWindow.show()
+        self.zoomWindow.setImage(self.allImages[self.currentPosition], self.loadedImage)
+        self.zoomWindow.raise_()
+
+    def prefetchImages(self):
+        first = max(0, self.currentPosition - self.prefetchBehind)
+        last = min(len(self.allImages), self.currentPosition + self.prefetchAhead + 1)
+
+        # Queue Upcoming Images First, Then Recent Ones
+        positions = list(range(self.currentPosition + 1, last)) + list(range(self.currentPosition - 1, first - 1, -1))
+        for position in positions:
+            key = (self.allImages[position], self.imageWidth)
+            if (not self.imageCache.contains(key) and key not in self.pendingImages):
+                self.pendingImages.add(key)
+                loader = ImageLoader(key[0], key[1], self.previewCache)
+                loader.signals.loaded.connect(self.imageLoaded)
+                self.threadPool.start(loader)
+
+    def imageLoaded(self, imageLocation, imageWidth, image):
+        self.pendingImages.discard((imageLocation, imageWidth))
+        if (not image.isNull()):
+            self.imageCache.put((imageLocation, imageWidth), QPixmap.fromImage(image))
         
     def centerWindow(self):
         qtRectangle = self.frameGeometry()
@@ -251,31 +2211,444 @@ class PhotoCollectorMain(QMainWindow):
         self.move(qtRectangle.topLeft())
 
     def keepImage(self):
+
+        # Decisions Need A Session To Go To
+        if (self.saveLocation == ""):
+            return
+        elif (self.gridMode):
+            self.decideSelectedImages("Keep")
+            return
         
         # Keep Image
-        copyfile(self.allImages[self.currentPosition], self.saveLocation + "/Keep/" + os.path.basename(self.allImages[self.currentPosition]))
+        self.decideImage(self.allImages[self.currentPosition], "Keep")
 
         # Update Image Window
-        if (self.currentPosition + 1 <= len(self.allImages) - 1):
-            self.currentPosition += 1
-            self.updateImage(self.allImages[self.currentPosition])
-        else:
-            QMessageBox.information(self, 'End of Images', "End of Images", QMessageBox.Ok)
-            self.resetMainWindow()
+        self.nextImage()
 
     def discardImage(self):
 
+        # Decisions Need A Session To Go To
+        if (self.saveLocation == ""):
+            return
+        elif (self.gridMode):
+            self.decideSelectedImages("Discard")
+            return
+
         # Discard Image
-        copyfile(self.allImages[self.currentPosition], self.saveLocation + "/Discard/" + os.path.basename(self.allImages[self.currentPosition]))
+        self.decideImage(self.allImages[self.currentPosition], "Discard")
 
         # Update Image Window
-        if (self.currentPosition + 1 <= len(self.allImages) - 1):
-            self.currentPosition += 1
-            self.updateImage(self.allImages[self.currentPosition])
-        else:
-            QMessageBox.information(self, 'End of Images', "End of Images", QMessageBox.Ok)
-            self.resetMainWindow()
+        self.nextImage()
     
+    def decideImage(self, imageLocation, folder):
+        self.queueTransfer(imageLocation, uniqueDestination(self.saveLocation + "/" + folder, imageLocation, self.destinations))
+
+    def queueTransfer(self, source, destination):
+        self.decisions[source] = os.path.basename(os.path.dirname(destination))
+        self.gridModel.rowChanged(self.knownImages[source])
+        self.journal.write({"event": "decision", "image": source, "destination": destination, "mode": self.transferMode})
+        self.startTransfer(source, destination, self.transferMode)
+
+    def startTransfer(self, source, destination, mode, overwrite=False):
+        worker = TransferWorker(source, destination, mode, overwrite)
+        worker.signals.finished.connect(self.transferFinished)
+        self.pendingTransfers += 1
+        self.transferPool.start(worker)
+        self.updateTransferStatus()
+
+    def transferFinished(self, source, destination, error):
+        self.pendingTransfers -= 1
+        self.updateTransferStatus()
+
+        # Journal Is Only Written On The GUI Thread
+        if (error == "" and self.journal is not None and os.path.normpath(os.path.dirname(os.path.dirname(destination))) == os.path.normpath(self.journal.folder)):
+            self.journal.write({"event": "transferred", "image": source})
+
+        # Resize Kept Images In The Background As They Arrive
+        if (error == "" and self.exportWhileKeeping and os.path.basename(os.path.dirname(destination)) == "Keep"):
+            self.queueExport([destination], os.path.join(os.path.dirname(os.path.dirname(destination)), EXPORT_FOLDER))
+
+        if (error != ""):
+            QMessageBox.information(self, 'Transfer Failed', "Could Not Transfer " + os.path.basename(source) + ": " + error, QMessageBox.Ok)
+
+    def updateTransferStatus(self):
+        if (self.pendingTransfers > 0):
+            self.statusBar().showMessage(str(self.pendingTransfers) + " Transfers Pending")
+        else:
+            self.statusBar().showMessage("All Transfers Complete", 3000)
+
+    def clearPreviewCache(self):
+        self.previewCache.clear()
+        self.statusBar().showMessage("Preview Cache Cleared", 3000)
+
+    def decideSelectedImages(self, folder):
+        rows = sorted(index.row() for index in self.gridView.selectionModel().selectedIndexes())
+        for row in rows:
+            if (self.allImages[row] not in self.decisions):
+                self.decideImage(self.allImages[row], folder)
+
+    def findSimilarImages(self):
+        if (self.similarImageFinder is not None):
+            return
+
+        # Decided Images May Already Have Been Moved Away
+        images = [image for image in self.allImages if image not in self.decisions]
+        self.similarImageFinder = SimilarImageFinder(self.scanId, images, self.imageHashes)
+        self.similarImageFinder.signals.progress.connect(self.similarImagesProgress)
+        self.similarImageFinder.signals.finished.connect(self.similarImagesFound)
+        QThreadPool.globalInstance().start(self.similarImageFinder)
+        self.statusBar().showMessage("Finding Similar Images...")
+
+    def similarImagesProgress(self, done, total):
+        self.statusBar().showMessage("Finding Similar Images: " + str(done) + " of " + str(total))
+
+    def similarImagesFound(self, scanId, hashes, groups):
+        self.similarImageFinder = None
+        if (scanId != self.scanId):
+            return
+
+        self.imageHashes = hashes
+        self.statusBar().clearMessage()
+
+        # Only Offer Groups That Still Need A Decision
+        groups = [[image for image in group if image not in self.decisions] for group in groups]
+        groups = [group for group in groups if len(group) > 1]
+
+        if (len(groups) == 0):
+            QMessageBox.information(self, 'No Similar Images', "No Similar Images Were Found.", QMessageBox.Ok)
+        else:
+            self.similarImagesWindow = SimilarImagesWindow(self, groups)
+            self.similarImagesWindow.show()
+
+    def refreshCurrentImage(self):
+
+        # Move On If The Shown Image Was Decided Elsewhere
+        if (not self.gridMode and self.currentPosition < len(self.allImages) and self.allImages[self.currentPosition] in self.decisions):
+            self.showImageAt(self.currentPosition)
+
+    def setGridMode(self, checked):
+        self.gridMode = checked
+
+        if (checked):
+            self.imageLabel.setVisible(False)
+            self.gridView.setVisible(True)
+            self.resize(1000, 700)
+            self.centerWindow()
+            self.gridView.setFocus()
+            if (self.currentPosition < len(self.allImages)):
+                self.gridView.scrollTo(self.gridModel.index(self.currentPosition), QAbstractItemView.PositionAtCenter)
+            self.thumbnailTimer.start()
+            self.enableMenuItems()
+        else:
+            self.gridView.setVisible(False)
+            self.imageLabel.setVisible(True)
+            self.cancelThumbnails(set())
+            self.thumbnailCache.clear()
+            self.enableMenuItems()
+
+            # Continue From The First Undecided Image
+            if (self.waitingForImages):
+                self.disableMenuItems()
+            elif (self.saveLocation != ""):
+                self.showImageAt(self.currentPosition)
+
+    def openGridImage(self, index):
+        self.currentPosition = index.row()
+        self.gridAction.setChecked(False)
+
+    def gridThumbnail(self, imageLocation):
+        key = (imageLocation, self.thumbnailWidth)
+        pixmap = self.thumbnailCache.get(key)
+        if (pixmap is None):
+            self.requestThumbnail(key)
+        return pixmap
+
+    def requestThumbnail(self, key):
+        if (key not in self.pendingThumbnails and not self.thumbnailCache.contains(key)):
+            loader = ImageLoader(key[0], key[1], self.previewCache)
+            loader.setAutoDelete(False)
+            loader.signals.loaded.connect(self.thumbnailLoaded)
+            self.pendingThumbnails[key] = loader
+            self.threadPool.start(loader)
+
+    def updateThumbnails(self):
+        if (not self.gridMode or len(self.allImages) == 0):
+            return
+
+        # Work Out Which Rows Are On Screen From The Uniform Grid
+        gridSize = self.gridView.gridSize()
+        viewport = self.gridView.viewport()
+        columns = max(1, viewport.width() // gridSize.width())
+        firstRow = self.gridView.verticalScrollBar().value() // gridSize.height() - self.thumbnailMargin
+        lastRow = (self.gridView.verticalScrollBar().value() + viewport.height()) // gridSize.height() + self.thumbnailMargin
+        first = max(0, firstRow * columns)
+        last = min(len(self.allImages), (lastRow + 1) * columns)
+
+        wanted = set()
+        for row in range(first, last):
+            key = (self.allImages[row], self.thumbnailWidth)
+            wanted.add(key)
+            self.requestThumbnail(key)
+
+        # Drop Queued Thumbnails That Scrolled Out Of View
+        self.cancelThumbnails(wanted)
+
+    def cancelThumbnails(self, wanted):
+        for key in list(self.pendingThumbnails.keys()):
+            if (key not in wanted and self.threadPool.tryTake(self.pendingThumbnails[key])):
+                del self.pendingThumbnails[key]
+
+    def thumbnailLoaded(self, imageLocation, imageWidth, image):
+        self.pendingThumbnails.pop((imageLocation, imageWidth), None)
+        if (not image.isNull() and self.gridMode):
+            self.thumbnailCache.put((imageLocation, imageWidth), QPixmap.fromImage(image))
+            if (imageLocation in self.knownImages):
+                self.gridModel.rowChanged(self.knownImages[imageLocation])
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.gridView.setGeometry(self.centralWidget().rect())
+
+    def setPerformanceOverlay(self, checked):
+        self.performanceLabel.setVisible(checked)
+        if (checked):
+            self.updatePerformanceOverlay()
+            self.performanceTimer.start()
+        else:
+            self.performanceTimer.stop()
+
+    def updatePerformanceOverlay(self):
+        lines = ["%-14s %6s %8s %8s %8s" % ("span", "count", "p50 ms", "p90 ms", "max ms")]
+        for name, count, median, slow, slowest in monitor.summary():
+            lines.append("%-14s %6d %8.1f %8.1f %8.1f" % (name, count, median, slow, slowest))
+        lines.append("cache %d MB, %d transfers pending" % (self.imageCache.usedBytes // (1024 * 1024), self.pendingTransfers))
+
+        self.performanceLabel.setText("\n".join(lines))
+        self.performanceLabel.adjustSize()
+        self.performanceLabel.move(0, self.modifier)
+        self.performanceLabel.raise_()
+
+    def togglePerformanceLog(self):
+        if (monitor.logFile is not None):
+            monitor.stopLog()
+            self.performanceLogAction.setText('Start Performance Log')
+            self.statusBar().showMessage("Performance Log Stopped", 3000)
+            return
+
+        logLocation, selectedFilter = QFileDialog.getSaveFileName(self, 'Save Performance Log', 'photomanager-performance.jsonl', 'JSON Lines (*.jsonl)')
+        if (logLocation != ""):
+            monitor.startLog(logLocation)
+            self.performanceLogAction.setText('Stop Performance Log')
+
+    def setWatchFolder(self, checked):
+        self.watchFolder = checked
+
+        if (self.saveLocation == ""):
+            return
+        elif (checked):
+            self.startWatching()
+        else:
+            self.stopWatching()
+
+            # Stop Waiting On Images That Will Never Arrive
+            if (self.waitingForImages and not self.scanRunning):
+                self.waitingForImages = False
+                QMessageBox.information(self, 'End of Images', "End of Images", QMessageBox.Ok)
+                self.resetMainWindow()
+
+    def startWatching(self):
+        self.stopWatching()
+        self.watching = True
+        self.folderListings = {}
+
+        # Watch Every Folder Images Have Come From
+        folders = {self.sourceFolder}
+        if (self.scanSubfolders):
+            folders.update(os.path.dirname(image) for image in self.allImages)
+        self.folderWatcher.addPaths(sorted(folders))
+
+        # Pick Up Anything Added Since The Folder Was Scanned
+        self.changedFolders.update(folders)
+        self.watchTimer.start()
+
+    def stopWatching(self):
+        self.watching = False
+        self.watchId += 1
+        self.folderLister = None
+        if (len(self.folderWatcher.directories()) > 0):
+            self.folderWatcher.removePaths(self.folderWatcher.directories())
+        self.changedFolders.clear()
+        self.pendingFiles.clear()
+        self.watchTimer.stop()
+        self.stableTimer.stop()
+
+    def folderChanged(self, folderName):
+        self.changedFolders.add(folderName)
+        self.watchTimer.start()
+
+    def checkChangedFolders(self):
+
+        # One Listing At A Time, Later Changes Wait For It To Finish
+        if (self.folderLister is not None or len(self.changedFolders) == 0):
+            return
+
+        # List Off The Main Thread So Large Folders Don't Freeze The Window
+        self.folderLister = FolderLister(self.watchId, self.changedFolders, self.folderListings)
+        self.folderLister.signals.listed.connect(self.foldersListed)
+        self.changedFolders = set()
+        QThreadPool.globalInstance().start(self.folderLister)
+
+    def foldersListed(self, watchId, images):
+        if (watchId != self.watchId):
+            return
+        self.folderLister = None
+
+        # Only Files Not Seen Before Are Considered
+        for image in images:
+            if (image not in self.knownImages and image not in self.pendingFiles):
+                self.pendingFiles[image] = None
+
+        if (len(self.pendingFiles) > 0 and not self.stableTimer.isActive()):
+            self.stableTimer.start()
+        if (len(self.changedFolders) > 0):
+            self.watchTimer.start()
+
+    def checkPendingFiles(self):
+        stableImages = []
+        for image, previous in list(self.pendingFiles.items()):
+            try:
+                stat = os.stat(image)
+            except OSError:
+                del self.pendingFiles[image]
+                continue
+
+            # Files Still Being Written Keep Changing Size
+            current = (stat.st_size, stat.st_mtime_ns)
+            if (current == previous and stat.st_size > 0):
+                stableImages.append(image)
+                del self.pendingFiles[image]
+            else:
+                self.pendingFiles[image] = current
+
+        if (len(stableImages) > 0):
+            self.appendImages(sorted(stableImages))
+        if (len(self.pendingFiles) == 0):
+            self.stableTimer.stop()
+
+    def setScanSubfolders(self, checked):
+        self.scanSubfolders = checked
+
+    def setSortByCaptureTime(self, checked):
+        self.sortByCaptureTime = checked
+
+    def setTransferMode(self, mode):
+        self.transferMode = mode
+
+    def setExportWhileKeeping(self, checked):
+        self.exportWhileKeeping = checked
+
+    def setExportWidths(self):
+        text, accepted = QInputDialog.getText(self, 'Export Sizes', "Widths In Pixels, Separated By Commas:", text=", ".join(str(width) for width in self.exportWidths))
+        if (not accepted):
+            return
+
+        try:
+            widths = sorted({int(width) for width in text.split(",") if width.strip() != ""}, reverse=True)
+        except ValueError:
+            widths = []
+        if (len(widths) == 0 or widths[-1] <= 0):
+            QMessageBox.information(self, 'Export Sizes', "Please Enter Widths As Whole Numbers, For Example 2048, 1024", QMessageBox.Ok)
+            return
+        self.exportWidths = widths
+
+    def exportKeptImages(self):
+
+        # Export Everything Already In The Keep Folder
+        saveLocation = self.saveLocation
+        if (saveLocation == ""):
+            saveLocation = QFileDialog.getExistingDirectory(self, 'Select Folder Containing Keep')
+            if (saveLocation == ""):
+                return
+
+        images = list(scanImages(os.path.join(saveLocation, "Keep")))
+        if (len(images) == 0):
+            QMessageBox.information(self, 'Nothing To Export', "No Kept Images Were Found.", QMessageBox.Ok)
+            return
+        self.queueExport(images, os.path.join(saveLocation, EXPORT_FOLDER))
+
+    def queueExport(self, images, exportFolder):
+
+        # Start The Exporter Once & Keep Feeding It
+        if (self.imageExporter is None):
+            self.imageExporter = ImageExporter()
+            self.imageExporter.signals.exported.connect(self.imageExported)
+            self.exportPool.start(self.imageExporter)
+
+        for image in images:
+            self.imageExporter.add(image, exportFolder, list(self.exportWidths))
+        self.exportCounts["total"] += len(images)
+        self.updateExportStatus()
+
+    def imageExported(self, imageLocation, outputs, error):
+        if (error != ""):
+            self.exportFailures.append(imageLocation)
+        elif (outputs > 0):
+            self.exportCounts["exported"] += 1
+        else:
+            self.exportCounts["skipped"] += 1
+        self.updateExportStatus()
+
+    def updateExportStatus(self):
+        counts = self.exportCounts
+        done = counts["exported"] + counts["skipped"] + len(self.exportFailures)
+        if (done < counts["total"]):
+            self.statusBar().showMessage("Exporting Images: " + str(done) + " of " + str(counts["total"]))
+            return
+
+        # Report Once Everything Queued So Far Is Done
+        self.statusBar().showMessage("Exported " + str(counts["exported"]) + " Images, " + str(counts["skipped"]) + " Already Up To Date", 3000)
+        failed = self.exportFailures
+        self.exportCounts = {"total": 0, "exported": 0, "skipped": 0}
+        self.exportFailures = []
+        if (len(failed) > 0):
+            QMessageBox.information(self, 'Export Failed', "Could Not Export " + ", ".join(os.path.basename(image) for image in failed), QMessageBox.Ok)
+
+    def closeEvent(self, event):
+
+        # Flush Transfer Queue Before Exit
+        self.waitForTransfers()
+
+        if (self.zoomWindow is not None):
+            self.zoomWindow.close()
+
+        # Unfinished Exports Are Redone Next Time Since Their Times Will Not Match
+        if (self.imageExporter is not None):
+            self.imageExporter.stop()
+
+        self.closeJournal()
+        monitor.stopLog()
+        event.accept()
+
+    def endSession(self):
+        self.waitForTransfers()
+        self.closeJournal()
+        self.resetMainWindow()
+
+    def waitForTransfers(self):
+        if (self.pendingTransfers > 0):
+            self.statusBar().showMessage("Finishing " + str(self.pendingTransfers) + " Transfers...")
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            self.transferPool.waitForDone()
+            QApplication.restoreOverrideCursor()
+
+            # Deliver The Queued Finished Signals So Transfers Are Journaled Before It Closes
+            QCoreApplication.sendPostedEvents()
+
+    def closeJournal(self):
+        if (self.journal is not None):
+            self.journal.close()
+            self.journal = None
+
     def openAbout(self):
         self.aboutWindow = AboutWindow()
         self.aboutWindow.show()
@@ -304,11 +2677,14 @@ class PhotoCollectorMain(QMainWindow):
         self.keepAction.setDisabled(False)
         self.discardAction.setDisabled(False)
 
-        self.fourHundredAction.setDisabled(False)
-        self.sixHundredAction.setDisabled(False)
-        self.eightHundredAction.setDisabled(False)
-        self.oneThousandAction.setDisabled(False)
-        self.twelveHundredAction.setDisabled(False)
+        self.fourHundredAction.setDisabled(self.gridMode)
+        self.sixHundredAction.setDisabled(self.gridMode)
+        self.eightHundredAction.setDisabled(self.gridMode)
+        self.oneThousandAction.setDisabled(self.gridMode)
+        self.twelveHundredAction.setDisabled(self.gridMode)
+        self.zoomAction.setDisabled(self.gridMode)
+        self.gridAction.setDisabled(False)
+        self.similarAction.setDisabled(False)
 
     def disableMenuItems(self):
         self.keepAction.setDisabled(True)
@@ -319,8 +2695,16 @@ class PhotoCollectorMain(QMainWindow):
         self.eightHundredAction.setDisabled(True)
         self.oneThousandAction.setDisabled(True)
         self.twelveHundredAction.setDisabled(True)
+        self.zoomAction.setDisabled(True)
+        self.gridAction.setDisabled(self.saveLocation == "")
+        self.similarAction.setDisabled(self.saveLocation == "")
 
     def resetMainWindow(self):
+        self.saveLocation = ""
+        self.stopWatching()
+        if (self.gridMode):
+            self.gridAction.setChecked(False)
+
         if (platform.system() == "Windows"):
             self.resize(800, 200)
         elif (platform.system() == "Darwin"):
@@ -332,8 +2716,151 @@ class PhotoCollectorMain(QMainWindow):
             
         self.loadLabel.setVisible(True)
         self.imageLabel.clear()
+        self.imageCache.clear()
+        self.tileCache.clear()
         self.disableMenuItems()
 
+        if (self.zoomWindow is not None):
+            self.zoomWindow.close()
+
+        # Groups From An Ended Session Have Nowhere To Go
+        if (self.similarImagesWindow is not None):
+            self.similarImagesWindow.close()
+            self.similarImagesWindow = None
+
+class ZoomWindow(QWidget):
+
+    def __init__(self, tileCache, threadPool):
+        super().__init__()
+
+        self.tileViewer = TileViewer(tileCache, threadPool)
+        self.initUI()
+
+    def initUI(self):
+        self.resize(1000, 700)
+
+        # Create our Containers to Hold our Components
+        self.vboxLayout = QVBoxLayout()
+        self.vboxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vboxLayout.addWidget(self.tileViewer)
+        self.setLayout(self.vboxLayout)
+
+    def setImage(self, imageLocation, preview):
+        self.tileViewer.setImage(imageLocation, preview)
+        size = self.tileViewer.imageSize
+        self.setWindowTitle(os.path.basename(imageLocation) + " (" + str(size.width()) + " x " + str(size.height()) + ", Actual Size)")
+
+    def keyPressEvent(self, event):
+        if (event.key() == Qt.Key_Escape):
+            self.close()
+        else:
+            super().keyPressEvent(event)
+
+class SimilarImagesWindow(QWidget):
+
+    def __init__(self, mainWindow, groups):
+        super().__init__()
+
+        self.mainWindow = mainWindow
+        self.groups = groups
+        self.groupPosition = 0
+        self.imageItems = {}
+
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('Similar Images')
+        self.resize(900, 450)
+
+        # Group Title Label
+        self.groupLabel = QLabel(self)
+
+        # Group Thumbnails
+        self.imageList = QListWidget(self)
+        self.imageList.setViewMode(QListView.IconMode)
+        self.imageList.setResizeMode(QListView.Adjust)
+        self.imageList.setMovement(QListView.Static)
+        self.imageList.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.imageList.setIconSize(QSize(self.mainWindow.thumbnailWidth, self.mainWindow.thumbnailWidth * 3 // 4))
+        self.imageList.setGridSize(QSize(self.mainWindow.thumbnailWidth + 16, self.mainWindow.thumbnailWidth * 3 // 4 + 32))
+
+        # Create Buttons
+        self.keepButton = QPushButton('Keep Selected, Discard Rest', self)
+        self.skipButton = QPushButton('Skip Group', self)
+
+        # Create Button Actions
+        self.keepButton.clicked.connect(self.keepSelected)
+        self.skipButton.clicked.connect(self.nextGroup)
+
+        # Create our Containers to Hold our Components
+        self.hboxLayout = QHBoxLayout()
+        self.hboxLayout.addWidget(self.skipButton)
+        self.hboxLayout.addWidget(self.keepButton)
+
+        self.vboxLayout = QVBoxLayout()
+        self.vboxLayout.addWidget(self.groupLabel)
+        self.vboxLayout.addWidget(self.imageList)
+        self.vboxLayout.addLayout(self.hboxLayout)
+
+        self.setLayout(self.vboxLayout)
+        self.showGroup()
+
+    def showGroup(self):
+
+        # Skip Groups Decided Since They Were Found
+        while (self.groupPosition < len(self.groups)):
+            group = [image for image in self.groups[self.groupPosition] if image not in self.mainWindow.decisions]
+            if (len(group) > 1):
+                break
+            self.groupPosition += 1
+
+        if (self.groupPosition >= len(self.groups)):
+            self.mainWindow.statusBar().showMessage("All Similar Images Reviewed", 3000)
+            self.close()
+            return
+
+        self.groups[self.groupPosition] = group
+        self.groupLabel.setText("Group " + str(self.groupPosition + 1) + " of " + str(len(self.groups)) + ": Select The Images To Keep")
+
+        self.imageList.clear()
+        self.imageItems = {}
+        for image in group:
+            item = QListWidgetItem(os.path.basename(image))
+            item.setToolTip(image)
+            self.imageList.addItem(item)
+            self.imageItems[image] = item
+
+            # Load Thumbnails In The Background
+            loader = ImageLoader(image, self.mainWindow.thumbnailWidth, self.mainWindow.previewCache)
+            loader.signals.loaded.connect(self.thumbnailLoaded)
+            self.mainWindow.threadPool.start(loader)
+
+        self.imageList.item(0).setSelected(True)
+
+    def thumbnailLoaded(self, imageLocation, imageWidth, image):
+        if (imageLocation in self.imageItems and not image.isNull()):
+            self.imageItems[imageLocation].setIcon(QIcon(QPixmap.fromImage(image)))
+
+    def keepSelected(self):
+        selected = [self.imageList.row(item) for item in self.imageList.selectedItems()]
+        if (self.mainWindow.saveLocation == ""):
+            self.close()
+            return
+        elif (len(selected) == 0):
+            return
+
+        # Keep The Chosen Frames & Discard The Rest Of The Group
+        for row, image in enumerate(self.groups[self.groupPosition]):
+            self.mainWindow.decideImage(image, "Keep" if row in selected else "Discard")
+
+        self.mainWindow.refreshCurrentImage()
+        if (self.mainWindow.saveLocation != ""):
+            self.nextGroup()
+
+    def nextGroup(self):
+        self.groupPosition += 1
+        self.showGroup()
+
 class AboutWindow(QWidget):
     
     def __init__(self):
@@ -417,6 +2944,7 @@ class AboutWindow(QWidget):
        self.close()
         
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     ex = PhotoCollectorMain()
     